@@ -0,0 +1,295 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 彩蛋资源缓存
+彩蛋图片在配置加载时解码并缩放到当前屏幕所需的尺寸，音频预先读入内存，
+抽取时直接取用，不再在Tk主线程中解码大图或读取磁盘；
+动图（GIF/APNG）的所有帧也只解码一次，超出单张动图的内存预算时整体缩小
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageSequence
+
+DEFAULT_IMAGE_CACHE_BYTES = 128 * 1024 * 1024  # 图片缓存上限：128MB
+DEFAULT_AUDIO_CACHE_BYTES = 64 * 1024 * 1024   # 音频缓存上限：64MB
+DEFAULT_ANIMATION_BYTES = 32 * 1024 * 1024     # 单张动图所有帧的内存预算：32MB
+DEFAULT_FRAME_DURATION = 100                   # 动图未指定帧时长时使用的默认值（毫秒）
+
+
+def egg_image_max_width(screen_width):
+    """
+    彩蛋图片的最大展示宽度（屏幕宽度的一半）
+    """
+    return int(screen_width * 0.5)
+
+
+def load_scaled_image(path, max_width):
+    """
+    解码图片并按最大宽度等比缩放
+    大图不先按原始分辨率完整解码：JPEG用draft()在解码阶段直接按1/2、1/4、1/8缩小，
+    其他格式在缩放时先按整数倍快速缩小，再用LANCZOS缩放到目标尺寸
+    :param path: 图片路径
+    :param max_width: 最大宽度（像素）
+    :return: 已完成解码的PIL图片
+    """
+    img = Image.open(path)
+    img_w, img_h = img.size
+    if img_w <= max_width:
+        img.load()
+        return img
+
+    target = (max_width, max(1, int(img_h * max_width / img_w)))
+    if img.format == 'JPEG':
+        # draft()选择不小于目标尺寸的最小缩放比例，JPEG解码器直接输出缩小后的图片
+        img.draft(img.mode, target)
+    # reducing_gap让resize先按整数倍快速缩小（支持所有模式，reduce()不支持调色板等模式）
+    return img.resize(target, Image.LANCZOS, reducing_gap=2.0)
+
+
+def write_display_copy(path, max_width):
+    """
+    生成展示尺寸的图片副本（文件名追加宽度后缀，保存在原图同目录）
+    :param path: 原图路径
+    :param max_width: 最大宽度（像素）
+    :return: 副本路径；原图不大于展示尺寸或为动图时返回原图路径
+    """
+    with Image.open(path) as img:
+        if img.width <= max_width or getattr(img, 'n_frames', 1) > 1:
+            return path
+        image_format = img.format
+
+    base, ext = os.path.splitext(path)
+    copy_path = f"{base}_{max_width}w{ext}"
+    scaled = load_scaled_image(path, max_width)
+    if image_format == 'JPEG':
+        scaled.convert('RGB').save(copy_path, format=image_format, quality=90)
+    else:
+        scaled.save(copy_path, format=image_format)
+    return copy_path
+
+
+def load_scaled_frames(path, max_width, max_bytes=DEFAULT_ANIMATION_BYTES):
+    """
+    解码图片的所有帧并等比缩放，静态图片只有一帧
+    :param path: 图片路径
+    :param max_width: 最大宽度（像素）
+    :param max_bytes: 所有帧的内存预算（字节），超出时进一步缩小尺寸
+    :return: (帧列表, 每帧时长列表（毫秒）)
+    """
+    img = Image.open(path)
+    if getattr(img, 'n_frames', 1) <= 1:
+        return [load_scaled_image(path, max_width)], [0]
+
+    img_w, img_h = img.size
+    scale = min(1.0, max_width / img_w)
+    # RGBA像素加上Tk中的一份拷贝
+    total = img_w * img_h * scale * scale * 4 * 2 * img.n_frames
+    if total > max_bytes:
+        scale *= math.sqrt(max_bytes / total)
+    size = (max(1, int(img_w * scale)), max(1, int(img_h * scale)))
+
+    frames = []
+    durations = []
+    for frame in ImageSequence.Iterator(img):
+        durations.append(frame.info.get('duration') or DEFAULT_FRAME_DURATION)
+        frame = frame.convert('RGBA')
+        if frame.size != size:
+            frame = frame.resize(size, Image.LANCZOS)
+        frames.append(frame)
+    return frames, durations
+
+
+class CachedImage:
+    """
+    缓存中的一张图片（动图为全部帧）
+    photos字段由Tk主线程在首次展示时创建（ImageTk.PhotoImage只能在主线程中创建）
+    """
+
+    __slots__ = ('frames', 'durations', 'nbytes', 'photos')
+
+    def __init__(self, frames, durations):
+        self.frames = frames
+        self.durations = durations
+        # 解码后的像素加上Tk中的一份拷贝
+        self.nbytes = sum(f.width * f.height * len(f.getbands()) * 2 for f in frames)
+        self.photos = None
+
+    @property
+    def image(self):
+        return self.frames[0]
+
+    @property
+    def size(self):
+        return self.frames[0].size
+
+    @property
+    def animated(self):
+        return len(self.frames) > 1
+
+    def get_photos(self, factory):
+        """
+        获取每帧对应的Tk图片，首次调用时创建（必须在Tk主线程中调用）
+        :param factory: 由PIL图片创建Tk图片的函数，如ImageTk.PhotoImage
+        """
+        if self.photos is None:
+            self.photos = [factory(frame) for frame in self.frames]
+        return self.photos
+
+
+class FileCache:
+    """
+    按字节数限制容量的LRU文件缓存，文件修改时间变化后缓存自动失效；可在后台线程中填充
+    子类的get()通过_get()查找，未命中时由传入的函数加载
+    """
+
+    def __init__(self, max_bytes):
+        """
+        :param max_bytes: 缓存容量上限（字节）
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # 键 -> (修改时间, 值, 字节数)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def _get(self, key, path, load):
+        """
+        :param key: 缓存键
+        :param path: 文件路径（用于检查修改时间）
+        :param load: 未命中时调用的加载函数，返回(值, 字节数)
+        :return: 缓存的值
+        """
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(key)
+                return entry[1]
+        # 加载在锁外进行，多个线程可以同时加载不同的文件
+        value, nbytes = load()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (mtime, value, nbytes)
+            self._bytes += nbytes
+            # 超出容量时淘汰最久未使用的项（至少保留刚放入的一项）
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class ImageCache(FileCache):
+    """
+    按字节数限制容量的LRU图片缓存，键为(绝对路径, 最大宽度)
+    """
+
+    def __init__(self, max_bytes=DEFAULT_IMAGE_CACHE_BYTES, animation_bytes=DEFAULT_ANIMATION_BYTES):
+        """
+        :param max_bytes: 缓存容量上限（字节）
+        :param animation_bytes: 单张动图的内存预算（字节）
+        """
+        super().__init__(max_bytes)
+        self.animation_bytes = min(animation_bytes, max_bytes)
+
+    def get(self, path, max_width):
+        """
+        获取缓存的图片，不存在或文件已被修改时解码并放入缓存
+        :param path: 图片路径
+        :param max_width: 最大宽度（像素）
+        :return: CachedImage
+        """
+        def load():
+            entry = CachedImage(*load_scaled_frames(path, max_width, self.animation_bytes))
+            return entry, entry.nbytes
+
+        return self._get((os.path.abspath(path), max_width), path, load)
+
+
+class AudioCache(FileCache):
+    """
+    按字节数限制容量的LRU音频文件缓存，缓存文件的原始字节
+    """
+
+    def __init__(self, max_bytes=DEFAULT_AUDIO_CACHE_BYTES):
+        """
+        :param max_bytes: 缓存容量上限（字节）
+        """
+        super().__init__(max_bytes)
+
+    def get(self, path):
+        """
+        获取音频文件内容，不存在或文件已被修改时从磁盘读取并放入缓存
+        :param path: 音频文件路径
+        :return: 文件内容（bytes）
+        """
+        def load():
+            with open(path, 'rb') as f:
+                data = f.read()
+            return data, len(data)
+
+        return self._get(os.path.abspath(path), path, load)
+
+
+class AssetPrefetcher:
+    """
+    后台资源预加载：在小型线程池中执行预加载任务，主线程可随时查询进度，不会阻塞
+    """
+
+    def __init__(self, max_workers=2):
+        """
+        :param max_workers: 线程池大小
+        """
+        self.max_workers = max_workers
+        self.total = 0
+        self.done = 0
+        self.failed = []  # [(描述, 异常), ...]
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+    def start(self, jobs):
+        """
+        开始预加载
+        :param jobs: [(描述, 无参函数), ...]
+        """
+        jobs = list(jobs)
+        self.total = len(jobs)
+        if not jobs:
+            return
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+        for description, func in jobs:
+            executor.submit(self._run, description, func)
+        # 不等待任务完成，线程池在任务全部结束后自动回收
+        executor.shutdown(wait=False)
+
+    def _run(self, description, func):
+        try:
+            func()
+        except Exception as e:
+            with self._lock:
+                self.failed.append((description, e))
+        finally:
+            with self._lock:
+                self.done += 1
@@ -0,0 +1,294 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 音频播放
+较短的彩蛋音频和预合成的朗读音频在预加载时解码为mixer.Sound并缓存，在保留声道上播放，
+播放结束通过pygame结束事件通知；较长的音频仍通过mixer.music流式播放。
+每次抽取的彩蛋音频和朗读由同一个有序的播放管线处理，关闭结果窗口即可取消本次抽取的全部声音
+"""
+
+import io
+import os
+import queue
+
+import pygame
+from pygame import mixer
+
+from asset_cache import FileCache
+from timing import NO_TIMINGS
+
+DEFAULT_STREAM_THRESHOLD = 2 * 1024 * 1024       # 大于此大小（字节）的音频文件流式播放
+DEFAULT_SOUND_CACHE_BYTES = 128 * 1024 * 1024    # 已解码音频缓存上限（解码后的PCM字节数）
+
+AUDIO_ORDERS = ["sequential", "parallel"]  # sequential: 彩蛋音频播完再朗读；parallel: 同时开始
+
+EGG_CHANNEL = 0      # 彩蛋音频使用的保留声道
+SPEECH_CHANNEL = 1   # 朗读音频使用的保留声道
+EGG_END_EVENT = pygame.USEREVENT + 1
+SPEECH_END_EVENT = pygame.USEREVENT + 2
+MUSIC_END_EVENT = pygame.USEREVENT + 3
+
+
+def sound_nbytes(sound):
+    """
+    估算已解码音频占用的内存（字节）
+    """
+    frequency, sample_format, channels = mixer.get_init()
+    return int(sound.get_length() * frequency * channels * (abs(sample_format) // 8))
+
+
+class SoundCache(FileCache):
+    """
+    按解码后字节数限制容量的LRU mixer.Sound缓存，文件修改时间变化后自动失效；可在后台线程中填充
+    """
+
+    def __init__(self, max_bytes=DEFAULT_SOUND_CACHE_BYTES):
+        """
+        :param max_bytes: 缓存容量上限（字节）
+        """
+        super().__init__(max_bytes)
+
+    def get(self, path):
+        """
+        获取解码后的音频，不存在或文件已被修改时解码并放入缓存
+        :param path: 音频文件路径
+        :return: mixer.Sound
+        """
+        def load():
+            sound = mixer.Sound(file=path)
+            return sound, sound_nbytes(sound)
+
+        return self._get(os.path.abspath(path), path, load)
+
+
+class AudioPlayer:
+    """
+    彩蛋音频和朗读音频的播放器（播放和结束事件处理都在Tk主线程中进行）
+    """
+
+    def __init__(self, audio_cache, sound_cache=None, stream_threshold=DEFAULT_STREAM_THRESHOLD,
+                 timings=NO_TIMINGS):
+        """
+        :param audio_cache: 流式播放时使用的音频文件缓存（asset_cache.AudioCache）
+        :param sound_cache: 已解码音频缓存，None表示新建
+        :param stream_threshold: 大于此大小（字节）的文件流式播放
+        :param timings: 各阶段耗时统计（timing.StageTimings）
+        """
+        self.audio_cache = audio_cache
+        self.timings = timings
+        self.sound_cache = sound_cache if sound_cache is not None else SoundCache()
+        self.stream_threshold = stream_threshold
+        self._callbacks = {}  # 结束事件类型 -> 播放结束后的回调
+        self._streamed = {}   # 音频路径 -> 是否流式播放（预加载时确定，抽取时不再访问文件系统）
+        mixer.set_reserved(2)
+        self.egg_channel = mixer.Channel(EGG_CHANNEL)
+        self.speech_channel = mixer.Channel(SPEECH_CHANNEL)
+        self.egg_channel.set_endevent(EGG_END_EVENT)
+        self.speech_channel.set_endevent(SPEECH_END_EVENT)
+        mixer.music.set_endevent(MUSIC_END_EVENT)
+
+    def should_stream(self, path):
+        """
+        文件较大时流式播放，不整体解码；结果按路径记住，只在首次（通常是预加载时）读取文件大小
+        """
+        stream = self._streamed.get(path)
+        if stream is None:
+            stream = os.path.getsize(path) > self.stream_threshold
+            self._streamed[path] = stream
+        return stream
+
+    def preload(self, path):
+        """
+        预加载音频（在预加载线程中调用）：短音频解码为Sound，长音频读入内存供流式播放
+        """
+        self._streamed.pop(path, None)  # 重新预加载时按当前文件大小和阈值重新判断
+        if self.should_stream(path):
+            self.audio_cache.get(path)
+        else:
+            self.sound_cache.get(path)
+
+    def play_egg(self, path, on_end=None):
+        """
+        播放彩蛋音频（回调在播放成功开始后才登记，播放失败时抛出异常）
+        :param path: 音频文件路径
+        :param on_end: 播放结束（或被停止）后的回调
+        """
+        self.stop_egg()
+        if self.should_stream(path):
+            # 优先使用预加载到内存中的音频，避免抽取时读取磁盘
+            with self.timings.measure("audio.music_load"):
+                mixer.music.load(io.BytesIO(self.audio_cache.get(path)), os.path.splitext(path)[1].lstrip('.'))
+            with self.timings.measure("audio.music_play"):
+                mixer.music.play()
+            self._callbacks[MUSIC_END_EVENT] = on_end
+        else:
+            with self.timings.measure("audio.sound_play"):
+                self.egg_channel.play(self.sound_cache.get(path))
+            self._callbacks[EGG_END_EVENT] = on_end
+
+    def play_speech(self, path, on_end=None):
+        """
+        播放预合成的朗读音频
+        :param path: WAV文件路径
+        :param on_end: 播放结束（或被停止）后的回调
+        """
+        self.stop_speech()
+        with self.timings.measure("audio.speech_clip_play"):
+            self.speech_channel.play(self.sound_cache.get(path))
+        self._callbacks[SPEECH_END_EVENT] = on_end
+
+    def _stop(self, event_types, stop_funcs):
+        # 先取下回调再停止，并清除停止时产生的结束事件，避免它被当成下一次播放的结束；
+        # 被停止的播放同样视为已结束，调用其回调
+        callbacks = [self._callbacks.pop(event_type, None) for event_type in event_types]
+        for stop_func in stop_funcs:
+            stop_func()
+        pygame.event.clear(event_types)
+        for callback in callbacks:
+            if callback is not None:
+                callback()
+
+    def stop_egg(self):
+        self._stop((EGG_END_EVENT, MUSIC_END_EVENT), (self.egg_channel.stop, mixer.music.stop))
+
+    def stop_speech(self):
+        self._stop((SPEECH_END_EVENT,), (self.speech_channel.stop,))
+
+    def stop(self):
+        self.stop_egg()
+        self.stop_speech()
+
+    @property
+    def busy(self):
+        return bool(self._callbacks)
+
+    def handle_events(self):
+        """
+        处理播放结束事件并调用对应回调（在Tk主线程中定时调用，只读取事件队列，不查询播放状态）
+        """
+        for event in pygame.event.get((EGG_END_EVENT, SPEECH_END_EVENT, MUSIC_END_EVENT)):
+            callback = self._callbacks.pop(event.type, None)
+            if callback is not None:
+                callback()
+
+
+class CancelToken:
+    """
+    一次抽取的取消标记
+    """
+
+    __slots__ = ('cancelled',)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class PlaybackRequest:
+    """
+    一次抽取的播放请求
+    """
+
+    __slots__ = ('text', 'voice', 'token')
+
+    def __init__(self, text, voice, token):
+        """
+        :param text: 要朗读的文字，None表示不朗读
+        :param voice: 彩蛋音频路径，None表示没有彩蛋音频
+        :param token: 取消标记
+        """
+        self.text = text
+        self.voice = voice
+        self.token = token
+
+
+class AudioPipeline:
+    """
+    有序的音频/朗读播放管线
+    任意线程都可以提交请求（线程安全队列），请求按提交顺序在Tk主线程中处理；
+    新请求会取消上一次抽取尚未播完的声音，同一时间只有一次抽取在发声
+    """
+
+    def __init__(self, player, speech_worker=None, clip_cache=None, order="sequential"):
+        """
+        :param player: AudioPlayer
+        :param speech_worker: 实时朗读线程（speech.SpeechWorker），None表示不朗读
+        :param clip_cache: 预合成朗读音频缓存（speech.SpeechClipCache），None表示始终实时朗读
+        :param order: 彩蛋音频与朗读的先后关系，见AUDIO_ORDERS
+        """
+        self.player = player
+        self.speech_worker = speech_worker
+        self.clip_cache = clip_cache
+        self.order = order
+        self._requests = queue.Queue()
+        self._current = None
+
+    def submit(self, text, voice=None):
+        """
+        提交一次抽取的播放请求（可在任意线程中调用）
+        :param text: 要朗读的文字，None表示不朗读
+        :param voice: 彩蛋音频路径，None表示没有彩蛋音频
+        :return: 本次请求的CancelToken
+        """
+        token = CancelToken()
+        self._requests.put(PlaybackRequest(text, voice, token))
+        return token
+
+    def process(self):
+        """
+        依次处理已提交的请求（在Tk主线程中调用）
+        """
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            self.cancel()
+            if not request.token.cancelled:
+                self._current = request
+                self._start(request)
+
+    def cancel(self):
+        """
+        取消当前抽取的彩蛋音频和朗读（在Tk主线程中调用）
+        """
+        if self._current is not None:
+            self._current.token.cancel()
+            self._current = None
+        # 先标记取消再停止，停止时触发的结束回调看到已取消的标记后不会继续朗读
+        self.player.stop()
+        if self.speech_worker is not None:
+            self.speech_worker.cancel()
+
+    def _start(self, request):
+        if request.voice and self.order == "sequential":
+            self._play_egg(request, on_end=lambda: self._speak(request))
+            return
+        if request.voice:
+            self._play_egg(request)
+        self._speak(request)
+
+    def _play_egg(self, request, on_end=None):
+        try:
+            self.player.play_egg(request.voice, on_end)
+        except Exception as e:
+            print(f"[WARN] 播放彩蛋音频失败: {e}")
+            if on_end is not None:
+                on_end()
+
+    def _speak(self, request):
+        if request.token.cancelled or not request.text or self.speech_worker is None:
+            return
+        # 已预先合成的直接播放音频文件，未命中或播放失败时才实时合成
+        clip = self.clip_cache.get(request.text) if self.clip_cache is not None else None
+        if clip is not None:
+            try:
+                self.player.play_speech(clip)
+                return
+            except Exception as e:
+                print(f"[WARN] 播放预合成朗读音频失败，改为实时朗读: {e}")
+        self.speech_worker.speak(request.text)
@@ -0,0 +1,45 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 抽取核心基准测试
+在无界面环境下测量picker_core一次点击的抽取耗时
+用法：python benchmarks/bench_picker.py [规模 ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from picker_core import Picker, compile_exclude_rules, DEFAULT_EXCLUDE_RULES
+from samplers import WEIGHTED_SAMPLERS
+
+
+def bench(size, draws=20000):
+    items = [f"姓名{i}" for i in range(size)]
+    leave = random.sample(items, min(size // 10, 1000))
+    print(f"\n规模: {size}（请假 {len(leave)} 人）")
+
+    configs = [("rotation", "fenwick")] + [("weighted", sampler) for sampler in WEIGHTED_SAMPLERS]
+    for mode, sampler in configs:
+        start = time.perf_counter()
+        picker = Picker(items, mode, sampler, compile_exclude_rules(DEFAULT_EXCLUDE_RULES, "names"))
+        picker.set_leave(leave)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        for _ in range(draws):
+            picker.draw()
+        draw_us = (time.perf_counter() - start) / draws * 1e6
+        label = mode if mode == "rotation" else f"{mode}/{sampler}"
+        print(f"  {label:18s} 构建: {build_ms:10.1f} ms   抽取: {draw_us:10.2f} us/次")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 50000]
+    for size in sizes:
+        bench(size)
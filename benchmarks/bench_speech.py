@@ -0,0 +1,148 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 朗读与音频基准测试
+在无界面、无声卡的Linux环境下测量朗读和彩蛋音频各阶段的耗时：
+语音引擎用可设置延迟的假引擎代替，pygame使用dummy音频/视频驱动
+用法：python benchmarks/bench_speech.py [朗读次数]
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+# 必须在导入pygame之前设置
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from pygame import mixer
+
+from asset_cache import AudioCache
+from audio import AudioPlayer, AudioPipeline
+from speech import SpeechWorker, SpeechClipCache
+from timing import StageTimings
+
+INIT_DELAY = 0.2     # 假引擎初始化耗时（秒）
+SAY_DELAY = 0.001    # say()耗时
+RUN_DELAY = 0.05     # runAndWait()耗时
+SAMPLE_RATE = 22050
+
+
+def write_silence(path, seconds):
+    """写入指定时长的静音WAV文件"""
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(struct.pack("<h", 0) * int(SAMPLE_RATE * seconds))
+
+
+class FakeEngine:
+    """
+    模拟pyttsx4引擎：按设定的延迟返回，save_to_file写入静音WAV
+    """
+
+    def __init__(self):
+        time.sleep(INIT_DELAY)
+        self._properties = {'voice': 'fake', 'rate': 150, 'volume': 0.9}
+        self._pending = []
+
+    def getProperty(self, name):
+        return self._properties[name]
+
+    def setProperty(self, name, value):
+        self._properties[name] = value
+
+    def connect(self, topic, callback):
+        pass
+
+    def say(self, text):
+        time.sleep(SAY_DELAY)
+
+    def save_to_file(self, text, path):
+        self._pending.append((text, path))
+
+    def runAndWait(self):
+        time.sleep(RUN_DELAY)
+        for text, path in self._pending:
+            write_silence(path, 0.2 * len(text))
+        self._pending.clear()
+
+    def stop(self):
+        pass
+
+
+def bench_live_speech(timings, count):
+    done = threading.Event()
+    worker = SpeechWorker(FakeEngine, on_success=done.set, timings=timings)
+    worker.start(preload=False)  # 首次朗读时初始化，计入speech.engine_init
+    for i in range(count):
+        done.clear()
+        with timings.measure("bench.speak_total"):
+            worker.speak(f"姓名{i}")
+            done.wait()
+    worker.shutdown()
+
+
+def bench_prerender(timings, directory, texts):
+    cache = SpeechClipCache(directory)
+    worker = SpeechWorker(FakeEngine, timings=timings)
+    worker.start()
+    with timings.measure("bench.prerender_total"):
+        worker.prerender(texts, cache)
+        while len(cache) < len(texts):
+            time.sleep(0.001)
+    worker.shutdown()
+    return cache
+
+
+def bench_playback(timings, directory, cache, texts, count):
+    short_path = os.path.join(directory, "egg_short.wav")
+    long_path = os.path.join(directory, "egg_long.wav")
+    write_silence(short_path, 1)
+    write_silence(long_path, 30)
+
+    player = AudioPlayer(AudioCache(), stream_threshold=SAMPLE_RATE * 2 * 5, timings=timings)
+    for path in (short_path, long_path):
+        player.preload(path)
+
+    for _ in range(count):
+        player.play_egg(short_path)
+        player.play_egg(long_path)
+        player.play_speech(cache.get(texts[0]))
+        player.stop()
+
+    pipeline = AudioPipeline(player, SpeechWorker(FakeEngine), cache, "parallel")
+    for i in range(count):
+        with timings.measure("bench.pipeline_process"):
+            pipeline.submit(texts[i % len(texts)], short_path)
+            pipeline.process()
+        player.handle_events()
+    pipeline.cancel()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pygame.init()
+    mixer.init(frequency=SAMPLE_RATE)
+    timings = StageTimings()
+    texts = [f"姓名{i}" for i in range(10)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        bench_live_speech(timings, count)
+        cache = bench_prerender(timings, directory, texts)
+        bench_playback(timings, directory, cache, texts, count)
+
+    print(f"假引擎延迟: 初始化 {INIT_DELAY * 1e3:.0f} ms, say {SAY_DELAY * 1e3:.0f} ms, "
+          f"runAndWait {RUN_DELAY * 1e3:.0f} ms")
+    print(timings.format_summary())
+    pygame.quit()
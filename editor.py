@@ -21,6 +21,8 @@ from tkinter.constants import *
 import pandas as pd
 from functools import partial
 import shutil
+from picker_core import DEFAULT_EXCLUDE_RULES, validate_exclude_rules
+from asset_cache import egg_image_max_width, write_display_copy
 
 # 全局变量
 CONFIG_TEMPLATE = {
@@ -30,6 +32,7 @@ CONFIG_TEMPLATE = {
     "seed_refresh_minutes": 5,
     "personal_mode": "rotation",
     "group_mode": "rotation",
+    "exclude_rules": [dict(rule) for rule in DEFAULT_EXCLUDE_RULES],
     "egg_cases": [],
     "egg_cases_group": []
 }
@@ -46,6 +49,22 @@ COLOR_MAP = {
 }
 REVERSE_COLOR_MAP = {v: k for k, v in COLOR_MAP.items()}
 
+# 排除规则类型与作用范围映射表
+EXCLUDE_TYPE_MAP = {
+    "包含": "contains",
+    "开头为": "prefix",
+    "结尾为": "suffix",
+    "完全等于": "exact",
+    "正则表达式": "regex"
+}
+REVERSE_EXCLUDE_TYPE_MAP = {v: k for k, v in EXCLUDE_TYPE_MAP.items()}
+EXCLUDE_SCOPE_MAP = {
+    "个人": "names",
+    "小组": "groups",
+    "全部": "all"
+}
+REVERSE_EXCLUDE_SCOPE_MAP = {v: k for k, v in EXCLUDE_SCOPE_MAP.items()}
+
 class ConfigEditor:
     def __init__(self, root):
         self.root = root
@@ -431,6 +450,48 @@ class ConfigEditor:
                                   wraplength=400)
         mode_desc_label.pack(anchor=W, pady=(20, 0))
 
+        # 排除规则设置
+        ttk.Separator(settings_frame, orient=HORIZONTAL).pack(fill=X, pady=20)
+
+        exclude_label = ttk.Label(settings_frame,
+                                text="排除规则：",
+                                font=('微软雅黑', 10))
+        exclude_label.pack(anchor=W, pady=(0, 10))
+
+        exclude_toolbar = ttk.Frame(settings_frame)
+        exclude_toolbar.pack(anchor=W, pady=(0, 5))
+
+        add_rule_btn = ttk.Button(exclude_toolbar, text="添加", command=self.add_exclude_rule)
+        add_rule_btn.pack(side=LEFT, padx=2)
+
+        delete_rule_btn = ttk.Button(exclude_toolbar, text="删除", command=self.delete_exclude_rule)
+        delete_rule_btn.pack(side=LEFT, padx=2)
+
+        self.exclude_rules_tree = ttk.Treeview(
+            settings_frame,
+            columns=('类型', '内容', '范围'),
+            show='headings',
+            height=5
+        )
+        self.exclude_rules_tree.column('类型', width=100, anchor='center')
+        self.exclude_rules_tree.column('内容', width=200, anchor='w')
+        self.exclude_rules_tree.column('范围', width=80, anchor='center')
+        self.exclude_rules_tree.heading('类型', text='类型')
+        self.exclude_rules_tree.heading('内容', text='内容')
+        self.exclude_rules_tree.heading('范围', text='范围')
+        self.exclude_rules_tree.pack(anchor=W, fill=X, pady=(0, 5))
+
+        exclude_desc_text = """排除规则说明：
+• 符合任一规则的姓名/分组不会被抽取（测试模式不受影响）
+• 规则在程序启动时统一匹配一次，不影响抽取速度
+• 默认规则：排除姓名中包含"111"的项目"""
+
+        exclude_desc_label = ttk.Label(settings_frame,
+                                     text=exclude_desc_text,
+                                     justify=LEFT,
+                                     wraplength=400)
+        exclude_desc_label.pack(anchor=W, pady=(20, 0))
+
         return frame
 
     def _on_auto_close_changed(self):
@@ -478,6 +539,79 @@ class ConfigEditor:
         self.config_data['group_mode'] = mode
         self.status_bar.config(text=f"小组抽取模式已设置为: {'轮转模式' if mode == 'rotation' else '加权模式'}")
 
+    def add_exclude_rule(self):
+        """添加排除规则"""
+        dialog = Toplevel(self.root)
+        dialog.title("添加排除规则")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        main_frame = ttk.Frame(dialog, padding="10")
+        main_frame.pack(fill=BOTH, expand=True)
+
+        ttk.Label(main_frame, text="类型:").grid(row=0, column=0, sticky=W, pady=5)
+        type_var = StringVar(value="包含")
+        ttk.Combobox(main_frame, textvariable=type_var, values=list(EXCLUDE_TYPE_MAP),
+                     state="readonly", width=12).grid(row=0, column=1, sticky=W, pady=5)
+
+        ttk.Label(main_frame, text="内容:").grid(row=1, column=0, sticky=W, pady=5)
+        pattern_var = StringVar()
+        pattern_entry = ttk.Entry(main_frame, textvariable=pattern_var, width=30)
+        pattern_entry.grid(row=1, column=1, sticky=W, pady=5)
+        pattern_entry.focus_set()
+
+        ttk.Label(main_frame, text="范围:").grid(row=2, column=0, sticky=W, pady=5)
+        scope_var = StringVar(value="个人")
+        ttk.Combobox(main_frame, textvariable=scope_var, values=list(EXCLUDE_SCOPE_MAP),
+                     state="readonly", width=12).grid(row=2, column=1, sticky=W, pady=5)
+
+        def on_ok():
+            rule = {
+                "type": EXCLUDE_TYPE_MAP[type_var.get()],
+                "pattern": pattern_var.get(),
+                "scope": EXCLUDE_SCOPE_MAP[scope_var.get()]
+            }
+            errors = validate_exclude_rules([rule])
+            if errors:
+                messagebox.showerror("错误", "\n".join(errors), parent=dialog)
+                return
+            # 首次编辑时把默认规则写入配置，避免保存后丢失
+            if 'exclude_rules' not in self.config_data:
+                self.config_data['exclude_rules'] = [dict(r) for r in DEFAULT_EXCLUDE_RULES]
+            self.config_data['exclude_rules'].append(rule)
+            self.refresh_exclude_rules_data()
+            self.is_modified = True
+            self.update_status_bar()
+            dialog.destroy()
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=3, column=0, columnspan=2, pady=10)
+        ttk.Button(button_frame, text="确定", command=on_ok).pack(side=LEFT, padx=5)
+        ttk.Button(button_frame, text="取消", command=dialog.destroy).pack(side=LEFT, padx=5)
+        pattern_entry.bind("<Return>", lambda event: on_ok())
+
+        dialog.update_idletasks()
+        width = dialog.winfo_width()
+        height = dialog.winfo_height()
+        x = (dialog.winfo_screenwidth() // 2) - (width // 2)
+        y = (dialog.winfo_screenheight() // 2) - (height // 2)
+        dialog.geometry(f'+{x}+{y}')
+
+    def delete_exclude_rule(self):
+        """删除选中的排除规则"""
+        selected = self.exclude_rules_tree.selection()
+        if not selected:
+            messagebox.showinfo("提示", "请先选择要删除的排除规则")
+            return
+        if 'exclude_rules' not in self.config_data:
+            self.config_data['exclude_rules'] = [dict(r) for r in DEFAULT_EXCLUDE_RULES]
+        indexes = sorted((self.exclude_rules_tree.index(item) for item in selected), reverse=True)
+        for index in indexes:
+            del self.config_data['exclude_rules'][index]
+        self.refresh_exclude_rules_data()
+        self.is_modified = True
+        self.update_status_bar()
+
     def _create_groups_tab(self):
         """创建分组管理标签页"""
         frame = ttk.Frame(self.notebook)
@@ -644,6 +778,22 @@ class ConfigEditor:
         group_mode_value = self.config_data.get('group_mode', 'rotation')  # 默认值为rotation
         self.group_mode_var.set(group_mode_value)
 
+        self.refresh_exclude_rules_data()
+
+    def refresh_exclude_rules_data(self):
+        """刷新排除规则列表"""
+        for item in self.exclude_rules_tree.get_children():
+            self.exclude_rules_tree.delete(item)
+
+        for rule in self.config_data.get('exclude_rules', DEFAULT_EXCLUDE_RULES):
+            rule_type = rule.get('type', 'contains')
+            scope = rule.get('scope', 'names')
+            self.exclude_rules_tree.insert('', END, values=(
+                REVERSE_EXCLUDE_TYPE_MAP.get(rule_type, rule_type),
+                rule.get('pattern', ''),
+                REVERSE_EXCLUDE_SCOPE_MAP.get(scope, scope)
+            ))
+
     def refresh_egg_data(self, key):
         """刷新彩蛋配置数据"""
         tree = self.personal_egg_tree if key == "egg_cases" else self.group_egg_tree
@@ -946,8 +1096,29 @@ class ConfigEditor:
             if file_path:
                 image_var.set(file_path)
         
-        image_btn = ttk.Button(main_frame, text="浏览...", command=browse_image)
-        image_btn.grid(row=3, column=2, sticky=W, padx=5, pady=5)
+        def shrink_image():
+            path = image_var.get()
+            if not path or not os.path.exists(path):
+                messagebox.showwarning("警告", "请先选择存在的图片文件", parent=dialog)
+                return
+            max_width = egg_image_max_width(self.root.winfo_screenwidth())
+            try:
+                copy_path = write_display_copy(path, max_width)
+            except Exception as e:
+                messagebox.showerror("错误", f"生成展示尺寸图片失败: {str(e)}", parent=dialog)
+                return
+            if copy_path == path:
+                messagebox.showinfo("提示", "图片已不大于展示尺寸（或为动图），无需处理", parent=dialog)
+            else:
+                image_var.set(copy_path)
+                messagebox.showinfo("提示", f"已生成宽度为{max_width}像素的图片副本：\n{copy_path}", parent=dialog)
+
+        image_btn_frame = ttk.Frame(main_frame)
+        image_btn_frame.grid(row=3, column=2, sticky=W, padx=5, pady=5)
+        image_btn = ttk.Button(image_btn_frame, text="浏览...", command=browse_image)
+        image_btn.pack(side=LEFT)
+        shrink_btn = ttk.Button(image_btn_frame, text="缩小", command=shrink_image)
+        shrink_btn.pack(side=LEFT, padx=(5, 0))
         
         # 语音文件
         voice_label = ttk.Label(main_frame, text="语音路径:")
@@ -994,7 +1165,7 @@ class ConfigEditor:
         help_text = """
 · 显示名称: 抽取时显示的文字，留空则显示原姓名/分组名
 · 文字颜色: 支持黑色、白色、红色、绿色、蓝色、黄色、紫色
-· 图片路径: 抽取时显示的图片，建议使用PNG格式
+· 图片路径: 抽取时显示的图片，建议使用PNG格式；手机拍摄的大图可点击"缩小"生成展示尺寸的副本
 · 语音路径: 抽取时播放的背景音频，支持MP3、WAV格式
 · 朗读文本: 朗读时使用的文字，留空则读取显示名称
 · 强制执行: 勾选后此彩蛋不受全局彩蛋开关影响，始终执行
@@ -0,0 +1,90 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 彩蛋索引
+配置加载时把彩蛋配置解析为 名字 -> 彩蛋记录 的字典，
+颜色校验和文件存在性检查只做一次，抽取时只需一次字典查找
+"""
+
+import os
+
+EGG_COLORS = ['black', 'white', 'red', 'green', 'blue', 'yellow', 'purple']
+
+
+class EggRecord:
+    """
+    解析完成的一条彩蛋配置
+    """
+
+    __slots__ = ('name', 'display_name', 'color', 'image', 'voice', 'read_str', 'force', 'error')
+
+    def __init__(self, name, display_name, color='black', image='', voice='', read_str='',
+                 force=False, error=None):
+        """
+        :param name: 名单中的名字
+        :param display_name: 展示的名字（new_name）
+        :param color: 名字颜色
+        :param image: 图片绝对路径，无图片时为空字符串
+        :param voice: 音频绝对路径，无音频时为空字符串
+        :param read_str: 特殊朗读文本，为空时朗读展示的名字
+        :param force: 彩蛋关闭时是否仍然强制执行
+        :param error: 配置有误时的错误信息，展示时提示而不执行彩蛋
+        """
+        self.name = name
+        self.display_name = display_name
+        self.color = color
+        self.image = image
+        self.voice = voice
+        self.read_str = read_str
+        self.force = force
+        self.error = error
+
+    @property
+    def special_read(self):
+        return self.read_str != ''
+
+
+def resolve_egg_case(case):
+    """
+    解析一条彩蛋配置
+    :param case: 配置文件中的彩蛋字典
+    :return: EggRecord
+    """
+    name = case['name']
+    record = EggRecord(name, case.get('new_name') or name,
+                       read_str=case.get('s_read_str') or '',
+                       force=bool(case.get('force', False)))
+
+    color = case.get('color') or ''
+    if color:
+        if color not in EGG_COLORS:
+            record.error = (f"彩蛋设置中的颜色 {color} 不合规,请使用"
+                            f"{','.join(repr(c) for c in EGG_COLORS)}中的一种")
+            return record
+        record.color = color
+
+    for field, label in (('image', '图片'), ('voice', '语音')):
+        path = case.get(field) or ''
+        if not path:
+            continue
+        if not os.path.exists(path):
+            record.error = f"找不到彩蛋设置中的{label}文件: {case[field]}"
+            return record
+        setattr(record, field, os.path.abspath(path))
+    return record
+
+
+def build_egg_index(cases):
+    """
+    构建彩蛋索引
+    :param cases: 配置文件中的彩蛋列表
+    :return: {名字: EggRecord}，同名彩蛋以第一条为准（与原线性查找一致）
+    """
+    index = {}
+    for case in cases:
+        if 'name' not in case or case['name'] in index:
+            continue
+        index[case['name']] = resolve_egg_case(case)
+    return index
@@ -15,8 +15,20 @@ import sys
 import platform
 import subprocess
 import socket
-from tkinter import font
 from pystray import Icon, Menu as PystrayMenu, MenuItem
+from samplers import WEIGHTED_SAMPLERS
+from picker_core import (Picker, DEFAULT_EXCLUDE_RULES, compile_exclude_rules, validate_exclude_rules,
+                         validate_cooldown)
+from snapshot import SnapshotWriter, read_snapshot, snapshot_path
+from asset_cache import ImageCache, AudioCache, AssetPrefetcher, egg_image_max_width
+from result_window import ResultWindowPool, FramePlayer, region_geometry, validate_displays
+from text_layout import LayoutCache, validate_text_fit
+from eggs import EGG_COLORS, build_egg_index
+from speech import SpeechWorker, SpeechClipCache, DEFAULT_PRERENDER_LIMIT, DEFAULT_SPEECH_CACHE_BYTES
+from audio import AudioPlayer, AudioPipeline, AUDIO_ORDERS, DEFAULT_STREAM_THRESHOLD
+from timing import StageTimings
+from reveal import (DEFAULT_REVEAL_ANIMATION, REVEAL_CANDIDATES, SlotMachineReveal, TextReel,
+                    validate_reveal_animation)
 
 def resource_path(relative_path):
     """获取打包后资源的绝对路径"""
@@ -34,9 +46,7 @@ from pygame import mixer
 pygame.init()
 mixer.init()
 
-import pyttsx4
 import platform
-from comtypes import CoInitialize
 import chardet
 from tkinter import messagebox, filedialog, simpledialog
 
@@ -148,28 +158,45 @@ root.config(bg='white')
 root.attributes("-transparentcolor", "white")
 config_path = "config.json"
 names = []
-names_use = []
 groups = []
-groups_use = []
+personal_picker = Picker([])  # 个人抽取器（轮转牌堆/加权抽样器、请假及排除状态）
+group_picker = Picker([])     # 小组抽取器
+snapshot_writer = None        # 抽取状态快照写入器
+snapshot_timer = None         # 快照延迟写入定时器
 now_use = 'name'
 have_w = False
 name = ''
 egg = True
-have_img = False
-leave_list = []
+leave_set = set()  # 请假名单
 now_move = False
 auto_close_enabled = True  # 自动关闭功能默认开启（会从配置文件读取）
 auto_close_timer = None  # 自动关闭定时器
-window = None  # 主显示窗口
-window_image = None  # 图片窗口
+window_pool = ResultWindowPool(root, resource_path('favicon.ico'))  # 可复用的展示窗口
+frame_player = FramePlayer(root)  # 动图彩蛋播放器
+display_regions = []  # 多屏输出的屏幕区域[(x, y, 宽, 高), ...]，为空时只在主屏幕展示
+layout_cache = LayoutCache(root)  # 名字窗口布局缓存
+egg_index = {}        # 个人彩蛋索引：名字 -> EggRecord
+egg_index_group = {}  # 小组彩蛋索引
+reveal_animation = dict(DEFAULT_REVEAL_ANIMATION)  # 揭晓动画设置
+current_reveal = None  # 正在播放的揭晓动画
+reveal_reel = None     # 揭晓动画使用的名字滚轮（缓存Canvas文字对象）
 tray_icon_instance = None  # 托盘图标实例
+image_cache = ImageCache()  # 已解码并缩放好的彩蛋图片缓存
+audio_cache = AudioCache()  # 已读入内存的彩蛋音频缓存（流式播放的长音频）
+stage_timings = StageTimings()  # 朗读、音频和窗口展示各阶段的耗时统计
+audio_player = AudioPlayer(audio_cache, timings=stage_timings)  # 彩蛋音频和预合成朗读音频的播放器
+audio_pipeline = AudioPipeline(audio_player)  # 每次抽取的彩蛋音频和朗读按顺序在同一管线中播放
+asset_prefetcher = None     # 后台资源预加载器
+startup_popup = None        # 启动提示弹窗（用于显示预加载进度）
 
 # 在全局变量区域添加
 voice_enabled = True
 error_shown = False
 first_read_successful = False  # 添加新变量：标记是否已成功执行过朗读
-read_queue = []  # 朗读请求队列
-is_reading = False  # 是否正在朗读
+speech_worker = None  # 常驻朗读线程
+speech_clips = None   # 预先合成的朗读音频缓存
+speech_prerender_limit = DEFAULT_PRERENDER_LIMIT     # 名单和小组总数不超过此数量时才预合成名单
+speech_cache_bytes = DEFAULT_SPEECH_CACHE_BYTES      # 预合成音频缓存目录的大小上限
 
 # 在全局变量区域添加拖动相关变量
 drag_start_x = 0
@@ -195,14 +222,14 @@ seed_refresh_timer = None  # 种子重新设置定时器
 # 在全局变量区域添加抽取模式相关变量
 personal_mode = "rotation"  # 个人抽取模式：rotation 或 weighted
 group_mode = "rotation"     # 小组抽取模式：rotation 或 weighted
+personal_cooldown = None    # 个人冷却次数：最近K次抽到的人暂不参与抽取（None为模式默认值）
+group_cooldown = None       # 小组冷却次数
+exclude_rules = DEFAULT_EXCLUDE_RULES  # 排除规则（匹配的名单项不参与抽取）
+weighted_sampler = "fenwick"  # 加权抽样算法：fenwick（默认，单次抽取最快）或 numpy（仅批量抽取较快）
 
 # 防抖相关变量
 debounce_timer = None       # 防抖定时器
 pending_action = None       # 待执行的操作
-personal_weights = {}       # 个人权重字典
-group_weights = {}          # 小组权重字典
-last_personal_selected = None  # 上一个抽到的个人
-last_group_selected = None    # 上一个抽到的小组
 
 # 设置Windows任务栏属性
 if platform.system() == 'Windows':
@@ -245,6 +272,7 @@ def show_error_popup(message, close_window=True, auto_close=False):
                        wraplength=350,  # 设置最大宽度，超过会自动换行
                        anchor=W)
     error_label.pack(fill=X, pady=(0, 10))
+    error_window.message_label = error_label  # 供调用方更新提示内容
 
     # 按钮框架
     button_frame = Frame(main_frame)
@@ -272,126 +300,133 @@ def show_error_popup(message, close_window=True, auto_close=False):
 
     # 不调用mainloop()，让Tkinter主事件循环处理
     # error_window.mainloop()  # 移除这行以避免阻塞
+    return error_window
     
 def read(name, voice):
     """
-    纯本地语音合成方案
+    播放彩蛋音频并朗读名字（交给音频管线，不阻塞、不创建线程）
+    上一次抽取尚未播完的声音会被取消
+    :param name: 要朗读的文字
+    :param voice: 彩蛋音频路径，为空表示没有彩蛋音频
     """
-    global voice_enabled, error_shown, first_read_successful, read_queue, is_reading
-
     # 彩蛋音频播放不受voice_enabled影响
-    if voice and os.path.exists(voice):
-        try:
-            mixer.music.load(voice)
-            mixer.music.play()
-            while mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-        except:
-            pass
+    audio_pipeline.submit(name if voice_enabled else None, voice or None)
+    audio_pipeline.process()
 
-    if not voice_enabled:
-        return
 
-    # 清空之前的朗读队列，只保留最新的请求，避免快速点击时队列累积
-    read_queue.clear()
+def stop_audio():
+    """
+    中止当前抽取的彩蛋音频和朗读
+    """
+    audio_pipeline.cancel()
 
-    # 将朗读请求添加到队列
-    read_queue.append(name)
 
-    # 如果当前没有正在进行的朗读，则开始处理队列
-    if not is_reading:
-        process_read_queue()
+def poll_audio_events():
+    """
+    在主线程中处理音频播放结束事件和其他线程提交的播放请求
+    """
+    try:
+        audio_player.handle_events()
+        audio_pipeline.process()
+    except Exception as e:
+        print(f"[WARN] 处理音频事件失败: {e}")
+    root.after(50, poll_audio_events)
 
-def process_read_queue():
-    """处理朗读队列中的请求"""
-    global read_queue, is_reading, first_read_successful, voice_enabled, error_shown
-    
-    # 如果队列为空或朗读已禁用，直接返回
-    if not read_queue or not voice_enabled:
-        is_reading = False
+
+def speech_texts():
+    """
+    获取需要预先合成的文字：彩蛋展示名和朗读文本在前；
+    名单和小组总数不超过speech_prerender_limit时再加上名单和小组，大名单只在抽到时实时朗读
+    """
+    texts = []
+    for index in (egg_index, egg_index_group):
+        for record in index.values():
+            texts.append(record.read_str or record.display_name)
+    if len(names) + len(groups) <= speech_prerender_limit:
+        texts.extend(names)
+        texts.extend(groups)
+    else:
+        print(f"[INFO] 名单超过{speech_prerender_limit}项，只预合成彩蛋朗读音频")
+    return texts
+
+
+def start_speech_worker(config_file):
+    """
+    启动常驻朗读线程（在后台预先初始化语音引擎），并在空闲时预先合成名单的朗读音频
+    :param config_file: 配置文件路径，音频缓存放在配置文件同目录的speech_cache文件夹中
+    """
+    global speech_worker, speech_clips
+    if speech_worker is None:
+        speech_worker = SpeechWorker(on_success=on_read_success,
+                                     on_error=lambda e: root.after(0, on_read_error, e),
+                                     timings=stage_timings)
+        speech_worker.start()
+        audio_pipeline.speech_worker = speech_worker
+    if not voice_enabled:
         return
-    
-    # 标记为正在朗读状态
-    is_reading = True
-    
-    # 获取队列中的第一个朗读请求
-    name = read_queue.pop(0)
-    
+    speech_clips = SpeechClipCache(os.path.join(os.path.dirname(os.path.abspath(config_file)), "speech_cache"),
+                                   speech_cache_bytes)
+    audio_pipeline.clip_cache = speech_clips
     try:
-        engine = pyttsx4.init()
-        
-        # 平台特定配置
-        if platform.system() == 'Windows':
-            voices = engine.getProperty('voices')
-            chinese_voices = [v for v in voices if 'Chinese' in v.name]
-            if chinese_voices:
-                engine.setProperty('voice', chinese_voices[0].id)
-            else:
-                raise Exception("未找到中文语音包")
-                
-        elif platform.system() == 'Darwin':
-            engine.setProperty('voice', 'com.apple.speech.synthesis.voice.ting-ting.premium')
-            
-        else:  # Linux
-            engine.setProperty('voice', 'chinese')
-        
-        engine.setProperty('rate', 150)
-        engine.setProperty('volume', 0.9)
-        
-        if platform.system() == 'Windows':
-            CoInitialize()
-        
-        # 移除回调函数设置，改用直接方式
-        engine.say(name)
-        engine.runAndWait()
-        
-        # 如果成功执行，标记为第一次朗读成功
-        if not first_read_successful:
-            first_read_successful = True
-        
-        # 朗读完成后，继续处理队列中的下一个请求
-        root.after(10, process_read_queue)  # 添加小延迟，避免过快占用资源
+        speech_worker.prerender(speech_texts(), speech_clips)
+    except OSError as e:
+        print(f"[WARN] 无法创建朗读音频缓存目录，将始终实时朗读: {e}")
 
-    except Exception as e:
-        # 在朗读失败后，继续处理队列中的下一个请求
-        root.after(10, process_read_queue)
-        
-        # 只在第一次朗读失败时禁用朗读功能并显示错误
-        if not first_read_successful:
-            voice_enabled = False
-            if not error_shown:
-                error_shown = True
-                show_error_popup(
-                    f"""由于您的系统不支持，姓名朗读功能已禁用。报错：
+
+def on_read_success():
+    """朗读成功时的回调（在朗读线程中调用）"""
+    global first_read_successful
+    first_read_successful = True
+
+
+def on_read_error(e):
+    """
+    朗读失败时的处理（在Tk主线程中调用）
+    """
+    global voice_enabled, error_shown
+
+    # 只在第一次朗读失败时禁用朗读功能并显示错误
+    if not first_read_successful:
+        voice_enabled = False
+        if not error_shown:
+            error_shown = True
+            show_error_popup(
+                f"""由于您的系统不支持，姓名朗读功能已禁用。报错：
 {str(e)}
-后续抽取中将禁用姓名朗读功能""", 
-                    close_window=False, auto_close=True
-                )
-        # 如果不是首次朗读（已有成功记录），则不作任何处理，保持朗读功能启用
+后续抽取中将禁用姓名朗读功能""",
+                close_window=False, auto_close=True
+            )
+    # 如果不是首次朗读（已有成功记录），则不作任何处理，保持朗读功能启用
+    else:
+        print(f"[WARN] 朗读失败，下次朗读时将重新初始化语音引擎: {e}")
 
 
-def auto_close_windows():
+def close_result_windows():
     """
-    自动关闭展示窗口的函数
+    隐藏正在展示的名字窗口和图片窗口，窗口留在窗口池中供下次抽取复用
     """
-    global have_w, window, window_image, have_img, auto_close_timer
+    global have_w, auto_close_timer
 
-    # 取消定时器
+    # 取消自动关闭定时器
     if auto_close_timer is not None:
         root.after_cancel(auto_close_timer)
         auto_close_timer = None
 
-    # 关闭图片窗口（如果有）
-    if have_img and window_image is not None and window_image.winfo_exists():
-        window_image.destroy()
-        have_img = False
+    cancel_reveal()
+    frame_player.stop()
+    # 关闭结果窗口时同时停止本次抽取的彩蛋音频和朗读
+    stop_audio()
+    window_pool.hide_all()
+    have_w = False
 
-    # 关闭名字窗口（如果有）
-    if have_w and window is not None and window.winfo_exists():
-        window.destroy()
-        have_w = False
 
-    print("[INFO] 自动关闭展示窗口")
+def auto_close_windows():
+    """
+    自动关闭展示窗口的函数
+    """
+    if have_w:
+        close_result_windows()
+        print("[INFO] 自动关闭展示窗口")
 
 
 def set_window_transparency(alpha):
@@ -477,90 +512,99 @@ def reseed_random():
     seed_refresh_timer = root.after(seed_refresh_interval, reseed_random)
 
 
-def initialize_weights():
+def initialize_pickers():
     """
-    初始化权重字典的函数
+    根据当前名单和抽取模式初始化抽取器的函数
     """
-    global personal_weights, group_weights, names, groups
-
-    # 初始化个人权重
-    personal_weights = {}
-    for name in names:
-        personal_weights[name] = 1.0  # 初始权重都为1.0
+    global personal_picker, group_picker
 
-    # 初始化小组权重
-    group_weights = {}
-    for group in groups:
-        group_weights[group] = 1.0  # 初始权重都为1.0
+    # 排除规则在此编译为每个名单项的排除位图，抽取时不再逐项匹配
+    personal_picker = Picker(names, personal_mode, weighted_sampler,
+                             compile_exclude_rules(exclude_rules, "names"), personal_cooldown)
+    group_picker = Picker(groups, group_mode, weighted_sampler,
+                          compile_exclude_rules(exclude_rules, "groups"), group_cooldown)
+    personal_picker.set_leave(leave_set)
+    group_picker.set_leave(leave_set)
 
-    print(f"[INFO] 权重已初始化 - 个人: {len(personal_weights)}个, 小组: {len(group_weights)}个")
+    print(f"[INFO] 抽取器已初始化 - 个人: {len(personal_picker.roster)}个, 小组: {len(group_picker.roster)}个")
 
 
-def weighted_choice(items, weights, exclude_last=None, exclude_char=None):
+def build_snapshot():
     """
-    基于权重的随机选择函数
-    :param items: 项目列表
-    :param weights: 权重字典
-    :param exclude_last: 要排除的上一个抽到的人
-    :param exclude_char: 要排除的字符（仅对个人模式有效）
-    :return: 选中的项目
+    收集需要持久化的抽取状态
     """
-    import random
-
-    # 获取有效项目（排除请假人员）
-    valid_items = [item for item in items if item not in leave_list]
-
-    # 如果指定了要排除的字符（仅对个人模式），过滤掉包含该字符的项目
-    if exclude_char:
-        valid_items = [item for item in valid_items if exclude_char not in item]
+    return {
+        "personal": personal_picker.snapshot(),
+        "group": group_picker.snapshot(),
+        "leave": sorted(leave_set),
+    }
 
-    if not valid_items:
-        # 如果没有有效项目，返回None
-        return None
 
-    # 如果只有一个有效项目，直接返回（避免无限循环）
-    if len(valid_items) == 1:
-        return valid_items[0]
-
-    # 排除上一个抽到的人
-    if exclude_last and exclude_last in valid_items:
-        valid_items = [item for item in valid_items if item != exclude_last]
+def schedule_snapshot():
+    """
+    抽取状态变化后延迟2秒保存快照，连续点击只写一次，写盘在后台线程完成
+    """
+    global snapshot_timer
 
-        # 如果排除后没有有效项目了，重新选择（不排除）
-        if not valid_items:
-            valid_items = [item for item in items if item not in leave_list]
+    if snapshot_writer is None:
+        return
+    if snapshot_timer is not None:
+        root.after_cancel(snapshot_timer)
 
-    # 获取对应权重
-    valid_weights = [weights.get(item, 1.0) for item in valid_items]
+    def submit():
+        global snapshot_timer
+        snapshot_timer = None
+        snapshot_writer.submit(build_snapshot())
 
-    # 计算权重总和
-    total_weight = sum(valid_weights)
+    snapshot_timer = root.after(2000, submit)
 
-    # 生成随机数
-    rand = random.random() * total_weight
 
-    # 根据权重选择项目
-    cumulative_weight = 0.0
-    for item, weight in zip(valid_items, valid_weights):
-        cumulative_weight += weight
-        if rand <= cumulative_weight:
-            return item
+def flush_snapshot():
+    """
+    立即保存抽取状态快照（退出或重启程序前调用）
+    """
+    global snapshot_timer
 
-    # 理论上不会到达这里，但为了安全起见
-    return valid_items[-1]
+    if snapshot_writer is None:
+        return
+    if snapshot_timer is not None:
+        root.after_cancel(snapshot_timer)
+        snapshot_timer = None
+    snapshot_writer.flush(build_snapshot())
 
 
-def update_weight(weights, selected_item):
+def restore_snapshot(config_file):
     """
-    更新权重（抽到后权重减半）
-    :param weights: 权重字典
-    :param selected_item: 被抽中的项目
+    读取上次保存的抽取状态，名单未变化时从上次的进度继续
+    :param config_file: 配置文件路径，快照文件保存在其同目录下
     """
-    if selected_item in weights:
-        old_weight = weights[selected_item]
-        new_weight = old_weight * 0.5  # 减半
-        weights[selected_item] = new_weight
-        print(f"[DEBUG] 权重更新: {selected_item} ({old_weight:.2f} -> {new_weight:.4f})")
+    global snapshot_writer, leave_set
+
+    path = snapshot_path(config_file)
+    snapshot_writer = SnapshotWriter(path)
+    data = read_snapshot(path)
+    if data is None:
+        return
+
+    # 快照内容来自磁盘，格式不对时丢弃快照重新开始，不能当作配置文件错误处理
+    try:
+        leave = data.get('leave', [])
+        if not isinstance(leave, list) or not all(isinstance(item, str) for item in leave):
+            raise ValueError("请假名单必须为字符串列表")
+        leave_set = set(leave)
+        personal_picker.set_leave(leave_set)
+        group_picker.set_leave(leave_set)
+        restored_personal = personal_picker.restore(data.get('personal'))
+        restored_group = group_picker.restore(data.get('group'))
+    except Exception as e:
+        print(f"[WARN] 抽取状态快照内容无效，将重新开始: {e}")
+        leave_set = set()
+        for picker in (personal_picker, group_picker):
+            picker.reset()
+            picker.set_leave(leave_set)
+        return
+    print(f"[INFO] 已恢复抽取状态 - 个人: {'是' if restored_personal else '否（名单或模式已变化）'}, "
+          f"小组: {'是' if restored_group else '否（名单或模式已变化）'}, 请假: {len(leave_set)}人")
 
 
 def execute_pending_action():
@@ -592,131 +636,244 @@ def handle_button_click(event, action_func):
     debounce_timer = root.after(200, execute_pending_action)
 
 
-def show_window(name, image_name, color, voice, s_read, s_read_str, parent_window=None):
+def display_texts():
+    """
+    获取所有可能展示的文字（名单、小组及彩蛋替换后的名字），用于预先计算窗口布局
+    """
+    texts = list(names) + list(groups)
+    for index in (egg_index, egg_index_group):
+        texts.extend(record.display_name for record in index.values())
+    return texts
+
+
+def start_asset_prefetch():
+    """
+    在后台线程池中预加载配置中引用的全部彩蛋图片和音频，进度显示在启动提示中
+    """
+    global asset_prefetcher
+
+    max_width = egg_image_max_width(layout_cache.screen[0])
+    images = set()
+    voices = set()
+    for index in (egg_index, egg_index_group):
+        for record in index.values():
+            if record.image:
+                images.add(record.image)
+            if record.voice:
+                voices.add(record.voice)
+
+    jobs = [(path, lambda path=path: image_cache.get(path, max_width)) for path in images]
+    jobs += [(path, lambda path=path: audio_player.preload(path)) for path in voices]
+    asset_prefetcher = AssetPrefetcher(max_workers=min(4, os.cpu_count() or 1))
+    asset_prefetcher.start(jobs)
+    root.after(100, poll_asset_prefetch)
+
+
+def update_startup_progress():
+    """
+    把预加载进度追加到启动提示中
+    """
+    prefetcher = asset_prefetcher
+    if prefetcher is None or startup_popup is None or not startup_popup.winfo_exists():
+        return
+    if prefetcher.finished:
+        progress = "资源预加载完成"
+    else:
+        progress = f"正在预加载彩蛋资源：{prefetcher.done}/{prefetcher.total}"
+    startup_popup.message_label.config(text=f"{startup_popup.base_message}\n{progress}")
+
+
+def poll_asset_prefetch():
+    """
+    在主线程中定时查询预加载进度并更新启动提示，不阻塞Tk事件循环
+    """
+    prefetcher = asset_prefetcher
+    if prefetcher is None:
+        return
+
+    update_startup_progress()
+    if not prefetcher.finished:
+        root.after(100, poll_asset_prefetch)
+        return
+
+    for path, e in prefetcher.failed:
+        print(f"[WARN] 预加载彩蛋资源失败: {path} ({e})")
+    print(f"[INFO] 资源预加载完成 - 图片: {len(image_cache)}张(约{image_cache.nbytes // 1024}KB), "
+          f"音频: {len(audio_player.sound_cache)}个已解码(约{audio_player.sound_cache.nbytes // 1024}KB), "
+          f"{len(audio_cache)}个流式播放(约{audio_cache.nbytes // 1024}KB)")
+
+
+def show_startup_popup(message):
+    """
+    显示启动提示，预加载进度会追加在提示内容之后
+    """
+    global startup_popup
+    startup_popup = show_error_popup(message, close_window=False, auto_close=True)
+    startup_popup.base_message = message
+    update_startup_progress()
+
+
+def show_window(name, image_name, color, voice, s_read, s_read_str, test_mode=False, reveal_from=None):
     """
     显示包含名字等信息的窗口函数
+    名字窗口和图片窗口取自窗口池，只更新文字、颜色、图片和位置，不创建新窗口
     :param name: 要显示的名字
     :param image_name: 要显示的图片名称（路径）
     :param color: 名字的颜色
     :param voice: 语音文件路径
     :param s_read: 是否特殊读取
     :param s_read_str: 特殊读取时的名字字符串
+    :param test_mode: 是否为测试模式（测试模式不自动关闭）
+    :param reveal_from: 揭晓动画的候选名单（picker_core.Roster），None表示不播放揭晓动画
     """
-    global have_w, window, window_image, have_img, auto_close_enabled, auto_close_timer
+    global have_w
 
     print(name)
 
-    # 修改这里：直接使用主窗口获取屏幕尺寸
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
+    # 新的抽取开始时中止上一次尚未播完的彩蛋音频和朗读
+    stop_audio()
 
-    # 修改图片窗口创建方式
-    if image_name != '':
-        window_image = Toplevel()
-        window_image.withdraw()  # 先隐藏窗口
-        window_image.iconbitmap(resource_path('favicon.ico'))
-        window_image.title("随机抽签器")
-        window_image.overrideredirect(1)
-
-        img = Image.open(image_name)
-        img_w, img_h = img.size
-        
-        max_img_width = int(screen_width * 0.5)
-        if img_w > max_img_width:
-            ratio = max_img_width / img_w
-            img_w = max_img_width
-            img_h = int(img_h * ratio)
-            img = img.resize((img_w, img_h), Image.LANCZOS)
-
-        x = (screen_width - img_w) // 2
-        imgfile = ImageTk.PhotoImage(img)
-        label_img = Label(window_image, image=imgfile)
-        label_img.image = imgfile
-        window_image.geometry(f"{img_w}x{img_h}+{x}+0")
-        label_img.pack()
-        have_img = True
-
-        window_image.deiconify()  # 完成所有设置后显示窗口
-
-    # 修改名字窗口处理
-    if parent_window:
-        window = parent_window
-        window.withdraw()  # 先隐藏窗口
-        window.deiconify()  # 统一使用deiconify显示
-    else:
-        window = Toplevel()
-        window.withdraw()  # 先隐藏窗口
-        window.iconbitmap(resource_path('favicon.ico'))
-        window.title("随机抽签器")
-        window.attributes('-toolwindow', True)
-        # Windows系统设置工具窗口样式
-        if platform.system() == 'Windows':
-            import ctypes
-            hwnd = ctypes.windll.user32.GetParent(window.winfo_id())
-            GWL_EXSTYLE = -20
-            WS_EX_TOOLWINDOW = 0x00000080
-            ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, WS_EX_TOOLWINDOW)
-    
-    # 动态计算字体大小（基于屏幕宽度）
-    base_font_size = 87  # 基准字体大小（1920x1080）
-    font_size = int(base_font_size * (screen_width / 1920))
-    font_size = max(40, min(font_size, 150))  # 设置合理范围
-    
-    # 替换测试标签的创建方式
-    # 创建字体对象
-    custom_font = font.Font(family='华文仿宋', size=font_size)
-    # 计算文本尺寸
-    text_width = custom_font.measure(name)
-    text_height = custom_font.metrics("linespace")
-    
-    # 优化窗口尺寸计算（减少边距）
-    window_width = int(text_width * 1.1 + 20)  # 10%边距 + 固定20px
-    window_height = int(text_height * 1.2 + 20)  # 20%边距 + 固定20px
-    
-    # 确保窗口最小尺寸（根据字体大小动态调整）
-    min_width = max(150, font_size * 2)  # 至少2个字的宽度
-    min_height = max(80, font_size + 20)  # 字体高度+20px
-    window_width = max(window_width, min_width)
-    window_height = max(window_height, min_height)
-    
-    # 计算居中位置
-    x = (screen_width - window_width) // 2
-    y = (screen_height - window_height) // 2
-    
-    window.geometry(f"{window_width}x{window_height}+{x}+{y}")
-    window.overrideredirect(1)
-    window.attributes('-topmost', True)
-    window.attributes('-alpha', 1)
-
-    # 实际显示标签（优化换行逻辑）
-    l = Label(window, 
-             text=name, 
-             font=('华文仿宋', font_size), 
-             fg=color,
-             wraplength=int(text_width * 1.05),  # 仅比实际宽度多5%
-             justify=CENTER)
-    l.place(relx=0.5, rely=0.5, anchor=CENTER)
-
-    if s_read:
-        name = s_read_str
-    thr_read = threading.Thread(target=read, args=(name, voice,))
-    thr_read.start()
+    name_slot = window_pool.name_window()
     have_w = True
-    window.deiconify()  # 完成所有设置后显示窗口
+    read_name = s_read_str if s_read else name
+
+    def finish():
+        show_result(name_slot, name, image_name, color, voice, read_name, test_mode)
+
+    # 结果已经确定，动画只负责展示（批量抽取的多行结果不播放动画）
+    if reveal_animation['enabled'] and reveal_from and not test_mode and "\n" not in name:
+        start_reveal(name_slot, name, color, reveal_from, finish)
+    else:
+        finish()
+
+
+def output_regions():
+    """
+    获取要展示结果的屏幕区域列表
+    """
+    if display_regions:
+        return display_regions
+    screen_width, screen_height = layout_cache.screen
+    return [(0, 0, screen_width, screen_height)]
+
+
+def start_reveal(name_slot, final, color, candidates, on_done):
+    """
+    在名字窗口中播放揭晓动画
+    :param name_slot: 名字窗口
+    :param final: 最终结果
+    :param color: 文字颜色
+    :param candidates: 候选名单（picker_core.Roster，只从可抽取的项目中随机取少量名字参与滚动，
+                       请假和被排除规则排除的项目不会出现）
+    :param on_done: 动画结束后的回调
+    """
+    global current_reveal, reveal_reel
+
+    reel_texts = [text for text in candidates.sample_eligible(REVEAL_CANDIDATES) if text != final]
+    # 窗口大小取所有候选名字布局的最大值，字号取最小值，保证滚动中的每个名字都放得下
+    layouts = [layout_cache.get(text) for text in reel_texts + [final]]
+    width = max(layout.width for layout in layouts)
+    height = max(layout.height for layout in layouts)
+    font_size = min(layout.font_size for layout in layouts)
+
+    canvas = name_slot.canvas
+    if reveal_reel is None or reveal_reel.canvas is not canvas:
+        reveal_reel = TextReel(canvas)
+    canvas.place(x=0, y=0, relwidth=1, relheight=1)
+    name_slot.show(region_geometry(width, height, output_regions()[0]))
+    canvas.update_idletasks()
+
+    def done():
+        global current_reveal
+        current_reveal = None
+        reveal_reel.clear()
+        canvas.place_forget()
+        on_done()
+
+    current_reveal = SlotMachineReveal(root, reveal_reel, reel_texts, final, (layout_cache.family, font_size),
+                                       color, reveal_animation['duration'], reveal_animation['fps'], done)
+    current_reveal.start()
+
+
+def cancel_reveal():
+    """
+    中止正在播放的揭晓动画
+    """
+    global current_reveal
+    if current_reveal is not None:
+        current_reveal.cancel()
+        current_reveal.reel.canvas.place_forget()
+        current_reveal = None
+
+
+def show_result(name_slot, name, image_name, color, voice, read_name, test_mode):
+    """
+    展示最终结果：彩蛋图片、名字，并开始朗读
+    多屏输出时布局和图片只计算、解码一次，每个屏幕区域只是窗口位置不同
+    """
+    global auto_close_timer
+
+    with stage_timings.measure("window.show"):
+        show_result_windows(name_slot, name, image_name, color)
+
+    read(read_name, voice)
 
     # 设置自动关闭定时器（如果功能开启且不是测试模式）
-    if auto_close_enabled and parent_window is None:
+    if auto_close_enabled and not test_mode:
         # 先取消之前的定时器（如果有）
         if auto_close_timer is not None:
             root.after_cancel(auto_close_timer)
         # 设置10秒后自动关闭
         auto_close_timer = root.after(10000, auto_close_windows)
 
+
+def show_result_windows(name_slot, name, image_name, color):
+    """
+    在每个屏幕区域显示图片窗口和名字窗口
+    """
+    regions = output_regions()
+
+    # 图片窗口
+    if image_name != '':
+        # 从缓存取已缩放到屏幕一半宽度的图片，命中时无需解码
+        try:
+            cached = image_cache.get(image_name, egg_image_max_width(layout_cache.screen[0]))
+            photos = cached.get_photos(ImageTk.PhotoImage)
+        except Exception as e:
+            # 图片无法加载时只显示名字（本次抽取已生效，不能因图片失败而不显示结果）
+            print(f"[WARN] 加载彩蛋图片失败: {e}")
+            image_name = ''
+    if image_name != '':
+        img_w, img_h = cached.size
+
+        frame_player.stop()
+        image_labels = []
+        for i, region in enumerate(regions):
+            image_slot = window_pool.image_window(i)
+            image_slot.label.config(image=photos[0])
+            image_slot.label.image = photos[0]
+            image_slot.show(region_geometry(img_w, img_h, region, top=True))
+            image_labels.append(image_slot.label)
+        # 动图（GIF/APNG）循环播放，关闭窗口时停止
+        if cached.animated:
+            frame_player.play(image_labels, photos, cached.durations)
+
+    # 窗口尺寸、位置和换行宽度取自布局缓存（名单已在配置加载后预先计算）
+    layout = layout_cache.get(name)
+
+    # 更新名字窗口的标签，完成所有设置后显示窗口
+    for i, region in enumerate(regions):
+        slot = name_slot if i == 0 else window_pool.name_window(i)
+        slot.label.config(text=name,
+                          font=layout.font,
+                          fg=color,
+                          wraplength=layout.wraplength)
+        slot.show(region_geometry(layout.width, layout.height, region))
+
 def set_leave_list():
     """
-    处理"请假名单"选项的函数，弹出可编辑的文本框窗口让用户输入请假者名单，并更新leave_list变量
+    处理"请假名单"选项的函数，弹出可编辑的文本框窗口让用户输入请假者名单，并更新leave_set变量
     """
-    global leave_list
     leave_window = Toplevel(root)
     leave_window.iconbitmap(resource_path('favicon.ico'))
     leave_window.title("随机抽签器 - 请假管理")
@@ -770,26 +927,33 @@ def set_leave_list():
                      font=('微软雅黑', 10))
     text_widget.pack(expand=True, fill=BOTH, pady=5)
     
-    # 初始化内容
-    for name in leave_list:
+    # 初始化内容（按名单顺序展示，不在名单中的排在最后）
+    for name in sorted(leave_set, key=lambda item: personal_picker.roster.index.get(item, len(names))):
         text_widget.insert(END, name + "\n")
 
     # 底部按钮框架
     bottom_frame = Frame(main_frame)
     bottom_frame.pack(pady=5)
 
-    def save_and_close():
-        global leave_list
-        new_list = text_widget.get("1.0", END).splitlines()
+    def read_text_set():
         # 过滤空行和纯空格行
-        leave_list = [line.strip() for line in new_list if line.strip()]
+        return {line.strip() for line in text_widget.get("1.0", END).splitlines() if line.strip()}
+
+    def save_and_close():
+        global leave_set
+        new_set = read_text_set()
+        # 只把增减的人员同步到抽取器
+        added = new_set - leave_set
+        removed = leave_set - new_set
+        leave_set = new_set
+        personal_picker.update_leave(added, removed)
+        group_picker.update_leave(added, removed)
+        schedule_snapshot()
         leave_window.destroy()
         show_error_popup("请假名单已更新！", close_window=False, auto_close=True)
 
     def check_unsaved_changes():
-        current_content = text_widget.get("1.0", END).strip()
-        original_content = '\n'.join(leave_list).strip()
-        if current_content != original_content:
+        if read_text_set() != leave_set:
             return messagebox.askyesno("未保存的更改", "是否放弃未保存的修改？")
         return True
 
@@ -908,81 +1072,34 @@ def show_about():
 
 
 
-def egg_show(name, mode="name", _test_window=None):
+def egg_show(name, mode="name", _test_mode=False):
     """
     根据彩蛋配置展示特殊效果的函数
+    彩蛋配置已在读取配置时解析为索引，这里只做一次字典查找，不访问文件系统
     :param name: 要展示的名字
     :param mode: 要使用的读取模式
     """
-    img = ''
-    color = 'black'
-    voice = ''
-    special_read = False
-    s_read_str = ''
+    index = egg_index_group if mode == "group" else egg_index
+    record = index.get(name)
+    reveal_from = (group_picker if mode == "group" else personal_picker).roster
 
     # 检查是否需要处理彩蛋（全局彩蛋开启 或 当前彩蛋强制执行）
-    should_process_egg = False
-    current_special_case = None
-
-    if mode=="name":
-        for special_case in config['egg_cases']:
-            if name == special_case['name']:
-                current_special_case = special_case
-                # 检查是否强制执行或全局彩蛋开启
-                force_execute = special_case.get('force', False)
-                should_process_egg = force_execute or egg
-                break
-    elif mode=="group":
-        for special_case in config['egg_cases_group']:
-            if name == special_case['name']:
-                current_special_case = special_case
-                # 检查是否强制执行或全局彩蛋开启
-                force_execute = special_case.get('force', False)
-                should_process_egg = force_execute or egg
-                break
-
-    if should_process_egg and current_special_case:
-        special_case = current_special_case
-        if ('new_name' in special_case) and (special_case['new_name'] != ""):
-            name = special_case['new_name']
-        if ('color' in special_case) and (special_case['color'] != ""):
-            # 检查颜色设置是否合规
-            if (special_case['color'] not in ['black', 'white', 'red', 'green', 'blue', 'yellow', 'purple']):
-                show_error_popup(f"彩蛋设置中的颜色 {special_case['color']} 不合规,请使用'black','white','red','green','blue','yellow','purple'中的一种")
-                return
-            else:
-                color = special_case['color']
-        if ('image' in special_case) and (special_case['image'] != ""):
-            # 检查图片文件是否存在
-            if (not os.path.exists(special_case['image'])):
-                show_error_popup(f"找不到彩蛋设置中的图片文件: {special_case['image']}")
-                return
-            else:
-                img = special_case['image']
-        if ('voice' in special_case) and (special_case['voice'] != ""):
-            # 检查语音文件是否存在
-            if (not os.path.exists(special_case['voice'])):
-                show_error_popup(f"找不到彩蛋设置中的语音文件: {special_case['voice']}")
-                return
-            else:
-                voice += special_case['voice']
-        if ('s_read_str' in special_case) and (special_case['s_read_str'] != ""):
-            s_read_str = special_case['s_read_str']
-
-            if s_read_str != '':
-                special_read = True
-        show_window(name, img, color, voice, special_read, s_read_str, _test_window)
+    if record is None or not (record.force or egg):
+        show_window(name, '', 'black', '', False, '', _test_mode, reveal_from)
+        return
 
-    else:
-        # 不播放任何音频
-        show_window(name, img, color, voice, special_read, s_read_str, _test_window)
+    if record.error:
+        show_error_popup(record.error)
+        return
+    show_window(record.display_name, record.image, record.color, record.voice,
+                record.special_read, record.read_str, _test_mode, reveal_from)
 
 
 def openwindow():
     """
     打开抽取名字窗口的函数
     """
-    global is_dragging, auto_close_timer, last_personal_selected
+    global is_dragging
 
     # 更新点击时间和透明度
     update_last_click_time()
@@ -990,63 +1107,19 @@ def openwindow():
     if is_dragging:
         is_dragging = False
         return
-    global have_w
     global name
-    global names
-    global names_use
-    global egg
-    global now_use
-    global groups
-    global groups_use
-    global window_image
-    global have_img
 
     if have_w:
-        # 手动关闭时取消自动关闭定时器
-        if auto_close_timer is not None:
-            root.after_cancel(auto_close_timer)
-            auto_close_timer = None
-        if have_img and window_image is not None:
-            window_image.destroy()
-            have_img = False
-        if window is not None:
-            window.destroy()
-        have_w = False
+        close_result_windows()
         return
 
-    global personal_mode, personal_weights
-
-    if personal_mode == "rotation":
-        # 轮转模式（原有逻辑）
-        if names_use == []:
-            names_use = names[:]
-
-        while True:
-            name = random.choice(names_use)
-            names_use.remove(name)
-            if name not in leave_list and "111" not in name:
-                break
-    elif personal_mode == "weighted":
-        # 加权模式
-        name = weighted_choice(names, personal_weights, last_personal_selected, "111")
-        if name is None:
-            # 如果没有有效项目，提示错误
-            show_error_popup("没有有效的抽取对象（可能所有人都请假了）", close_window=False)
-            return
-        # 更新权重
-        update_weight(personal_weights, name)
-        # 记录这次抽取的结果
-        last_personal_selected = name
-    else:
-        # 默认使用轮转模式
-        if names_use == []:
-            names_use = names[:]
-
-        while True:
-            name = random.choice(names_use)
-            names_use.remove(name)
-            if name not in leave_list and "111" not in name:
-                break
+    # 轮转模式从牌堆弹出，加权模式按权重抽取（抽中后权重减半）
+    name = personal_picker.draw()
+    if name is None:
+        # 如果没有有效项目，提示错误
+        show_error_popup("没有有效的抽取对象（可能所有人都请假了）", close_window=False)
+        return
+    schedule_snapshot()
 
     egg_show(name)
 
@@ -1055,7 +1128,7 @@ def openwindow_group():
     """
     打开抽取分组窗口的函数
     """
-    global is_dragging, auto_close_timer, last_group_selected
+    global is_dragging
 
     # 更新点击时间和透明度
     update_last_click_time()
@@ -1063,72 +1136,76 @@ def openwindow_group():
     if is_dragging:
         is_dragging = False
         return
-    global window, window_image
-    global have_w, have_img
     global name
-    global groups
-    global groups_use
 
     if have_w:
-        # 手动关闭时取消自动关闭定时器
-        if auto_close_timer is not None:
-            root.after_cancel(auto_close_timer)
-            auto_close_timer = None
-        # 关闭图片窗口（如果有）
-        if have_img and window_image is not None and window_image.winfo_exists():
-            window_image.destroy()
-            have_img = False
-        # 关闭名字窗口
-        if window is not None and window.winfo_exists():
-            window.destroy()
-        have_w = False
+        close_result_windows()
         return
 
-    global group_mode, group_weights
-
-    if group_mode == "rotation":
-        # 轮转模式（原有逻辑）
-        if groups_use == []:
-            groups_use = groups[:]
-
-        name = random.choice(groups_use)
-        groups_use.remove(name)
-    elif group_mode == "weighted":
-        # 加权模式
-        name = weighted_choice(groups, group_weights, last_group_selected)
-        if name is None:
-            # 如果没有有效项目，提示错误
-            show_error_popup("没有有效的小组抽取对象", close_window=False)
-            return
-        # 更新权重
-        update_weight(group_weights, name)
-        # 记录这次抽取的结果
-        last_group_selected = name
-    else:
-        # 默认使用轮转模式
-        if groups_use == []:
-            groups_use = groups[:]
-
-        name = random.choice(groups_use)
-        groups_use.remove(name)
+    name = group_picker.draw()
+    if name is None:
+        # 如果没有有效项目，提示错误
+        show_error_popup("没有有效的小组抽取对象", close_window=False)
+        return
+    schedule_snapshot()
 
     egg_show(name,"group")
 
 
+def draw_batch(k, mode="name"):
+    """
+    一次抽取k个不同的姓名/小组
+    加权模式使用加权无放回抽样，轮转模式从牌堆中连续抽取k个
+    :param k: 抽取数量
+    :param mode: "name" 或 "group"
+    :return: 抽中的项目列表（可抽取数量不足时少于k个）
+    """
+    picker = group_picker if mode == "group" else personal_picker
+    picked = picker.draw_many(k)
+    schedule_snapshot()
+    return picked
+
+
+def openwindow_batch(mode="name"):
+    """
+    批量抽取并在同一个窗口中展示结果的函数
+    :param mode: "name" 或 "group"
+    """
+    update_last_click_time()
+
+    # 先关闭正在展示的窗口
+    if have_w:
+        close_result_windows()
+
+    total = len(groups) if mode == "group" else len(names)
+    k = simpledialog.askinteger(title='随机抽签器 - 批量抽取',
+                                prompt='请输入要抽取的数量',
+                                minvalue=1, maxvalue=max(1, total))
+    if not k:
+        return
+
+    picked = draw_batch(k, mode)
+    if not picked:
+        show_error_popup("没有有效的抽取对象（可能所有人都请假了）", close_window=False)
+        return
+    if len(picked) < k:
+        print(f"[WARN] 可抽取数量不足，仅抽取了{len(picked)}个")
+
+    # 每行最多展示5个，朗读时依次读出
+    rows = ["  ".join(picked[i:i + 5]) for i in range(0, len(picked), 5)]
+    show_window("\n".join(rows), '', 'black', '', True, "，".join(picked))
+
+
 def reset():
     """
     重置名字列表的函数
     """
     print('已重置个人抽取记忆')
-    global names, names_use, personal_weights
-    names_use = names[:]
-
-    # 如果是加权模式，重置权重
-    if personal_mode == "weighted":
-        initialize_weights()
+    # 轮转模式重新洗牌；加权模式重置权重和上一个抽取记录
+    personal_picker.reset()
+    if personal_picker.mode == "weighted":
         print('已重置个人权重')
-        global last_personal_selected
-        last_personal_selected = None  # 重置上一个抽取记录
+    schedule_snapshot()
 
 
 def reset_group():
@@ -1136,15 +1213,10 @@ def reset_group():
     重置分组列表的函数
     """
     print('已重置小组抽取记忆')
-    global groups, groups_use, group_weights
-    groups_use = groups[:]
-
-    # 如果是加权模式，重置权重
-    if group_mode == "weighted":
-        initialize_weights()
+    group_picker.reset()
+    if group_picker.mode == "weighted":
         print('已重置小组权重')
-        global last_group_selected
-        last_group_selected = None  # 重置上一个抽取记录
+    schedule_snapshot()
 
 
 def egg_set():
@@ -1183,15 +1255,26 @@ def cleanup_and_exit():
     """
     清理资源并退出程序的函数
     """
-    global tray_icon_instance, read_queue, is_reading, voice_enabled
+    global tray_icon_instance, voice_enabled
+
+    # 保存抽取状态，下次启动时继续
+    try:
+        flush_snapshot()
+    except Exception as e:
+        print(f"[ERROR] 保存抽取状态时出错: {e}")
+
+    # 打印各阶段耗时汇总
+    if stage_timings.on_record is not None:
+        print(stage_timings.format_summary())
 
     # 停止所有朗读操作
     try:
         voice_enabled = False  # 禁用语音功能
-        read_queue.clear()     # 清空朗读队列
-        is_reading = False     # 重置朗读状态
+        if speech_worker is not None:
+            speech_worker.shutdown()  # 中止朗读并结束朗读线程
         # 停止pygame音乐播放
         if 'mixer' in globals() and mixer.get_init():
+            mixer.stop()
             mixer.music.stop()
     except Exception as e:
         print(f"[ERROR] 停止朗读操作时出错: {e}")
@@ -1237,6 +1320,12 @@ def restart_program():
     script_path = os.path.abspath(sys.argv[0])
 
     try:
+        # 保存抽取状态，重启后从当前进度继续
+        try:
+            flush_snapshot()
+        except Exception as e:
+            print(f"[ERROR] 保存抽取状态时出错: {e}")
+
         # 先清理当前进程的资源
         global tray_icon_instance
         if tray_icon_instance is not None:
@@ -1293,18 +1382,9 @@ def test():
     """
     entry_str = simpledialog.askstring(title='随机抽签器 - 测试', prompt='输入要测试效果的姓名/组')
     if (entry_str in names) or (entry_str in groups):
-        test_window = Toplevel()
-        test_window.withdraw()
-        test_window.iconbitmap(resource_path('favicon.ico'))
-        test_window.title("随机抽签器 - 测试模式")
-        test_window.attributes('-toolwindow', True)
-        if platform.system() == 'Windows':
-            import ctypes
-            hwnd = ctypes.windll.user32.GetParent(test_window.winfo_id())
-            GWL_EXSTYLE = -20
-            WS_EX_TOOLWINDOW = 0x00000080
-            ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, WS_EX_TOOLWINDOW)
-        egg_show(entry_str, _test_window=test_window)
+        if have_w:
+            close_result_windows()
+        egg_show(entry_str, _test_mode=True)
     else:
         show_error_popup("所输入的姓名/组号不在配置文件给定列表之内", close_window=False)
 
@@ -1413,7 +1493,7 @@ def validate_config(config):
                 errors.append(f"{name}配置缺少'name'字段")
             
             # 检查颜色值
-            if 'color' in case and case['color'] not in ['black', 'white', 'red', 'green', 'blue', 'yellow', 'purple']:
+            if 'color' in case and case['color'] not in EGG_COLORS:
                 errors.append(f"{name}配置中的颜色值不合法: {case['color']}")
             
             # 检查文件存在性
@@ -1422,6 +1502,48 @@ def validate_config(config):
                     if not os.path.exists(case[file_type]):
                         errors.append(f"{name}配置中的{file_type}文件不存在: {case[file_type]}")
     
+    # 检查排除规则
+    if 'exclude_rules' in config:
+        errors.extend(validate_exclude_rules(config['exclude_rules']))
+
+    # 检查冷却设置
+    for field in ['personal_cooldown', 'group_cooldown']:
+        if field in config:
+            errors.extend(validate_cooldown(config[field], field))
+
+    # 检查文字适配设置
+    if 'text_fit' in config:
+        errors.extend(validate_text_fit(config['text_fit']))
+
+    # 检查揭晓动画设置
+    if 'reveal_animation' in config:
+        errors.extend(validate_reveal_animation(config['reveal_animation']))
+
+    # 检查音频流式播放阈值
+    if 'audio_stream_threshold_kb' in config:
+        threshold = config['audio_stream_threshold_kb']
+        if isinstance(threshold, bool) or not isinstance(threshold, int) or threshold < 0:
+            errors.append(f"audio_stream_threshold_kb必须为非负整数: {threshold}")
+
+    # 检查朗读音频预合成设置
+    for field in ('speech_prerender_limit', 'speech_cache_mb'):
+        if field in config:
+            value = config[field]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                errors.append(f"{field}必须为非负整数: {value}")
+
+    # 检查彩蛋音频与朗读的播放顺序
+    if 'audio_order' in config and config['audio_order'] not in AUDIO_ORDERS:
+        errors.append(f"audio_order必须为{'、'.join(AUDIO_ORDERS)}之一: {config['audio_order']}")
+
+    # 检查耗时日志开关
+    if 'log_timings' in config and not isinstance(config['log_timings'], bool):
+        errors.append("log_timings必须为true或false")
+
+    # 检查多屏输出设置
+    if 'displays' in config:
+        errors.extend(validate_displays(config['displays']))
+
     # 检查重复项
     if len(config['names']) != len(set(config['names'])):
         errors.append("姓名列表中存在重复项")
@@ -1437,7 +1559,7 @@ def read_config(path):
     :param path: 配置文件路径
     """
     print(f"[INFO] 正在读取配置文件: {path}")
-    global names, groups, config, leave_list, auto_close_enabled
+    global names, groups, config, auto_close_enabled
     try:
         with open(path, 'rb') as f:
             rawdata = f.read()
@@ -1456,9 +1578,12 @@ def read_config(path):
                 
                 # 读取姓名和分组列表，并确保所有项目都是字符串类型
                 names = [str(name) for name in config['names']]
-                names_use = names[:]
                 groups = [str(group) for group in config['groups']]
-                groups_use = groups[:]
+
+                # 构建彩蛋索引（颜色和文件检查只在这里做一次）
+                global egg_index, egg_index_group
+                egg_index = build_egg_index(config['egg_cases'])
+                egg_index_group = build_egg_index(config['egg_cases_group'])
 
                 # 读取自动关闭设置（可选字段，默认值为True）
                 if 'auto_close' in config:
@@ -1502,13 +1627,85 @@ def read_config(path):
                 else:
                     print("[INFO] 使用默认小组抽取模式")
 
-                # 初始化权重（在所有配置读取完成后）
-                initialize_weights()
+                # 读取冷却设置（可选字段，默认轮转模式不冷却、加权模式避开上一个）
+                global personal_cooldown, group_cooldown
+                personal_cooldown = config.get('personal_cooldown')
+                group_cooldown = config.get('group_cooldown')
+                print(f"[INFO] 冷却设置 - 个人: {personal_cooldown}, 小组: {group_cooldown}")
+
+                # 读取排除规则（可选字段，默认排除包含"111"的姓名）
+                global exclude_rules
+                if 'exclude_rules' in config:
+                    exclude_rules = config['exclude_rules']
+                    print(f"[INFO] 排除规则: {len(exclude_rules)}条")
+                else:
+                    exclude_rules = DEFAULT_EXCLUDE_RULES
+                    print("[INFO] 使用默认排除规则")
+
+                # 读取加权抽样算法设置（可选字段，默认值为fenwick）
+                global weighted_sampler
+                if 'weighted_sampler' in config:
+                    if config['weighted_sampler'] in WEIGHTED_SAMPLERS:
+                        weighted_sampler = config['weighted_sampler']
+                        print(f"[INFO] 加权抽样算法: {weighted_sampler}")
+                    elif config['weighted_sampler'] == 'numpy':
+                        weighted_sampler = "fenwick"
+                        print("[WARN] 未安装NumPy，加权抽样算法回退为fenwick")
+                    else:
+                        print(f"[WARN] 配置文件weighted_sampler字段无效，使用默认值")
+                else:
+                    print("[INFO] 使用默认加权抽样算法")
+
+                # 初始化抽取器（在所有配置读取完成后），并恢复上次的抽取进度
+                initialize_pickers()
+                restore_snapshot(path)
+
+                # 读取音频流式播放阈值（可选字段），较小的彩蛋音频预先解码，较大的流式播放
+                audio_player.stream_threshold = config.get('audio_stream_threshold_kb',
+                                                           DEFAULT_STREAM_THRESHOLD // 1024) * 1024
+                # 耗时日志（可选字段，默认关闭）：开启后打印每个阶段的耗时，退出时打印汇总
+                if config.get('log_timings', False) is True:
+                    stage_timings.on_record = lambda stage, seconds: print(
+                        f"[INFO] 耗时 {stage}: {seconds * 1e3:.1f}ms")
+
+                # 彩蛋音频与朗读的播放顺序（可选字段，默认彩蛋音频播完再朗读）
+                audio_pipeline.order = config.get('audio_order', "sequential")
+                print(f"[INFO] 彩蛋音频与朗读顺序: {audio_pipeline.order}")
+                root.after(50, poll_audio_events)
+
+                # 朗读音频预合成的名单规模和缓存大小上限（可选字段）
+                global speech_prerender_limit, speech_cache_bytes
+                speech_prerender_limit = config.get('speech_prerender_limit', DEFAULT_PRERENDER_LIMIT)
+                speech_cache_bytes = config.get('speech_cache_mb',
+                                                DEFAULT_SPEECH_CACHE_BYTES // (1024 * 1024)) * 1024 * 1024
+
+                # 启动常驻朗读线程，语音引擎只初始化一次
+                start_speech_worker(path)
+
+                # 在后台预加载彩蛋图片和音频，首次抽到时无需再解码或读盘
+                start_asset_prefetch()
+                # 读取多屏输出设置（可选字段，默认只在主屏幕展示）
+                global display_regions
+                display_regions = [(region['x'], region['y'], region['width'], region['height'])
+                                   for region in config.get('displays', [])]
+                if display_regions:
+                    print(f"[INFO] 多屏输出: {len(display_regions)}个屏幕区域")
+
+                # 提前创建展示窗口，首次抽取时只需更新内容
+                root.after_idle(window_pool.prewarm, len(output_regions()))
+                # 分批预先计算名单中所有名字的窗口布局
+                layout_cache.configure_fit(config.get('text_fit'))
+                print(f"[INFO] 文字适配方式: {layout_cache.text_fit['mode']}")
+
+                # 读取揭晓动画设置（可选字段，默认关闭）
+                global reveal_animation
+                reveal_animation = dict(DEFAULT_REVEAL_ANIMATION, **config.get('reveal_animation', {}))
+                if reveal_animation['enabled']:
+                    print(f"[INFO] 揭晓动画已开启: {reveal_animation['duration']}秒, {reveal_animation['fps']}帧/秒")
+                layout_cache.precompute(display_texts())
                 # 延迟显示启动提示，避免阻塞随机种子初始化
-                root.after(100, lambda: show_error_popup(
-                    f"程序已开始运行，请使用屏幕右下角的方块按钮来抽取！\n当前使用的配置文件：{os.path.abspath(path)}",
-                    close_window=False,
-                    auto_close=True  # 添加自动关闭参数
+                root.after(100, lambda: show_startup_popup(
+                    f"程序已开始运行，请使用屏幕右下角的方块按钮来抽取！\n当前使用的配置文件：{os.path.abspath(path)}"
                 ))
 
                 # 初始化透明度系统
@@ -1553,6 +1750,27 @@ def create_sample_config(parent=None, exit_after=True):
                 "seed_refresh_minutes": 5,  # 随机种子刷新间隔（分钟）
                 "personal_mode": "rotation",  # 个人抽取模式：rotation 或 weighted
                 "group_mode": "rotation",    # 小组抽取模式：rotation 或 weighted
+                "weighted_sampler": "fenwick",  # 加权抽样算法：fenwick（推荐，单次抽取最快）或 numpy（需安装NumPy，单次抽取慢得多，仅一次批量抽取大量项目时较快）
+                # 冷却次数：最近K次抽到的暂不参与抽取，可按模式分别设置
+                "personal_cooldown": {"rotation": 0, "weighted": 1},
+                "group_cooldown": {"rotation": 0, "weighted": 1},
+                # 排除规则：type为contains/prefix/suffix/exact/regex，scope为names/groups/all
+                "exclude_rules": [{"type": "contains", "pattern": "111", "scope": "names"}],
+                # 文字适配：screen按屏幕宽度确定字号；auto自动缩放到展示区域内（区域为占屏幕宽高的比例）
+                "text_fit": {"mode": "screen", "box_width": 0.8, "box_height": 0.4},
+                # 揭晓动画：公布结果前滚动显示候选名字（duration为秒数）
+                "reveal_animation": {"enabled": False, "duration": 1.5, "fps": 30},
+                # 多屏输出：每项为一个屏幕区域（虚拟桌面坐标），为空时只在主屏幕展示
+                # 例如 [{"x": 0, "y": 0, "width": 1920, "height": 1080}, {"x": 1920, "y": 0, "width": 1920, "height": 1080}]
+                "displays": [],
+                # 大于此大小（KB）的彩蛋音频流式播放，较小的预先解码以便立即播放
+                "audio_stream_threshold_kb": 2048,
+                # 彩蛋音频与朗读：sequential为彩蛋音频播完再朗读，parallel为同时开始
+                "audio_order": "sequential",
+                # 名单和小组总数不超过此数量时预先合成名单的朗读音频（彩蛋始终预合成），0表示只预合成彩蛋
+                "speech_prerender_limit": 1000,
+                "speech_cache_mb": 256,  # 预合成朗读音频缓存目录的大小上限（MB）
+                "log_timings": False,  # 打印朗读、音频和窗口展示各阶段的耗时
                 "egg_cases": [{
                     "name": "示例姓名1",
                     "new_name": "示例姓名1的展示名",
@@ -1667,6 +1885,7 @@ def create_tray_icon(root, config_path):
 
 menu = Menu(root)
 menu.add_cascade(label='测试模式', command=test)
+menu.add_cascade(label='批量抽取', command=openwindow_batch)
 menu.add_cascade(label='移动窗口', command=move)  # 初始标签为"移动窗口"
 menu.add_cascade(label='重置个人', command=reset)
 menu.add_cascade(label='重置小组', command=reset_group)
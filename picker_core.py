@@ -0,0 +1,413 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 抽取核心
+保存名单、请假集合、排除规则以及轮转牌堆/加权抽样器等全部抽取状态，
+不依赖tkinter/pygame，可在脚本或无界面环境中导入、测试和做性能分析
+>>> picker = Picker(["张三", "李四", "王五"], mode="weighted")
+>>> picker.set_leave(["李四"])
+>>> picker.draw() in ("张三", "王五")
+True
+"""
+
+import hashlib
+import random
+import re
+
+from samplers import FenwickSampler, RotationDeck, WEIGHTED_SAMPLERS
+
+MODES = ("rotation", "weighted")
+WEIGHT_DECAY = 0.5  # 加权模式下抽中后权重乘以此系数
+
+# 排除规则类型：包含、前缀、后缀、完全匹配、正则表达式
+EXCLUDE_RULE_TYPES = ("contains", "prefix", "suffix", "exact", "regex")
+# 排除规则作用范围：个人名单、小组名单、全部
+EXCLUDE_RULE_SCOPES = ("names", "groups", "all")
+# 配置文件未设置exclude_rules时的默认规则（兼容旧版的"111"标记）
+DEFAULT_EXCLUDE_RULES = [{"type": "contains", "pattern": "111", "scope": "names"}]
+# 各模式默认的冷却次数：加权模式默认避开上一个抽到的项目
+DEFAULT_COOLDOWN = {"rotation": 0, "weighted": 1}
+
+
+def resolve_cooldown(value, mode):
+    """
+    解析配置文件中的冷却设置
+    :param value: 整数（对所有模式生效）、按模式区分的字典，或None
+    :param mode: 当前抽取模式
+    :return: 冷却次数K
+    """
+    if isinstance(value, dict):
+        value = value.get(mode)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        return DEFAULT_COOLDOWN.get(mode, 0)
+    return value
+
+
+def validate_cooldown(value, field):
+    """
+    检查冷却设置
+    :param value: 配置文件中的冷却字段
+    :param field: 字段名，用于错误信息
+    :return: 错误信息列表
+    """
+    values = value.values() if isinstance(value, dict) else [value]
+    if isinstance(value, dict) and not set(value) <= set(MODES):
+        return [f"{field}只能按rotation/weighted分别设置"]
+    for v in values:
+        if isinstance(v, bool) or not isinstance(v, int) or v < 0:
+            return [f"{field}必须为非负整数: {v}"]
+    return []
+
+
+def validate_exclude_rules(rules):
+    """
+    检查排除规则配置
+    :param rules: 配置文件中的exclude_rules字段
+    :return: 错误信息列表
+    """
+    if not isinstance(rules, list):
+        return ["排除规则(exclude_rules)必须为数组格式"]
+    errors = []
+    for n, rule in enumerate(rules, start=1):
+        if not isinstance(rule, dict):
+            errors.append(f"第{n}条排除规则必须为对象格式")
+            continue
+        rule_type = rule.get('type', 'contains')
+        pattern = rule.get('pattern')
+        if rule_type not in EXCLUDE_RULE_TYPES:
+            errors.append(f"第{n}条排除规则的类型不合法: {rule_type}")
+        if rule.get('scope', 'names') not in EXCLUDE_RULE_SCOPES:
+            errors.append(f"第{n}条排除规则的作用范围不合法: {rule.get('scope')}")
+        if not isinstance(pattern, str) or pattern == "":
+            errors.append(f"第{n}条排除规则缺少'pattern'字段")
+        elif rule_type == "regex":
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                errors.append(f"第{n}条排除规则的正则表达式不合法: {pattern}（{e}）")
+    return errors
+
+
+def compile_exclude_rules(rules, scope):
+    """
+    编译排除规则，名单加载时对每个项目匹配一次
+    非正则规则已转义，合并为一个正则表达式；正则规则各自单独编译，
+    与validate_exclude_rules的检查方式一致（全局标志、分组编号都只在本条规则内生效）
+    :param rules: 排除规则列表（需已通过validate_exclude_rules检查）
+    :param scope: "names" 或 "groups"，只编译作用于该名单的规则
+    :return: 编译后的正则表达式列表，没有适用规则时返回None
+    """
+    literals = []
+    patterns = []
+    for rule in rules:
+        if rule.get('scope', 'names') not in (scope, 'all'):
+            continue
+        rule_type = rule.get('type', 'contains')
+        pattern = rule['pattern']
+        if rule_type == "regex":
+            patterns.append(re.compile(pattern))
+        else:
+            escaped = re.escape(pattern)
+            literals.append({
+                "contains": escaped,
+                "prefix": f"^{escaped}",
+                "suffix": f"{escaped}$",
+                "exact": f"^{escaped}$",
+            }[rule_type])
+    if literals:
+        patterns.insert(0, re.compile("|".join(literals)))
+    return patterns or None
+
+
+class Roster:
+    """
+    名单：项目列表及其排除状态（请假、排除规则）
+    可抽取状态预先计算为与items下标对齐的位图，请假名单变化时只更新变化的项目
+    """
+
+    __slots__ = ('items', 'index', 'leave', 'rule_excluded', 'eligible', '_digest')
+
+    def __init__(self, items, exclude=None):
+        """
+        :param items: 项目列表（不可重复）
+        :param exclude: 编译后的排除规则（见compile_exclude_rules），匹配的项目永远不会被抽取
+        """
+        self.items = [str(item) for item in items]
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self.leave = set()
+        searches = [pattern.search for pattern in exclude or ()]
+        self.rule_excluded = bytearray(
+            any(search(item) is not None for search in searches) for item in self.items
+        )
+        self.eligible = bytearray(1 - excluded for excluded in self.rule_excluded)
+        self._digest = None
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def digest(self):
+        """名单内容的哈希值，用于判断持久化的抽取状态是否属于当前名单"""
+        if self._digest is None:
+            self._digest = hashlib.sha1("\0".join(self.items).encode('utf-8')).hexdigest()
+        return self._digest
+
+    def is_excluded(self, i):
+        """第i项是否不可抽取"""
+        return not self.eligible[i]
+
+    def excluded_mask(self):
+        """与items下标对齐的排除标记列表"""
+        return [not eligible for eligible in self.eligible]
+
+    def set_leave(self, leave):
+        """
+        整体设置请假名单并重新计算可抽取位图，O(n)
+        :param leave: 请假人员的可迭代对象，可包含不在名单中的项目
+        """
+        self.leave = set(leave)
+        leave = self.leave
+        rule_excluded = self.rule_excluded
+        self.eligible = bytearray(
+            not rule_excluded[i] and item not in leave for i, item in enumerate(self.items)
+        )
+
+    def update_leave(self, added=(), removed=()):
+        """
+        增量更新请假名单，O(变化数)
+        :param added: 新增的请假人员
+        :param removed: 销假的人员
+        :return: 可抽取状态发生变化的项目列表[(项目, 是否排除), ...]
+        """
+        changes = []
+        eligible = self.eligible
+        for item in removed:
+            self.leave.discard(item)
+            i = self.index.get(item)
+            if i is not None and not eligible[i] and not self.rule_excluded[i]:
+                eligible[i] = 1
+                changes.append((item, False))
+        for item in added:
+            self.leave.add(item)
+            i = self.index.get(item)
+            if i is not None and eligible[i]:
+                eligible[i] = 0
+                changes.append((item, True))
+        return changes
+
+    def sample_eligible(self, k, rng=random):
+        """
+        随机取至多k个不重复的可抽取项目（仅用于展示，不影响抽取状态）
+        大名单先随机挑下标再跳过不可抽取的项目，不需要遍历整个名单
+        :param k: 数量
+        :param rng: 随机数生成器
+        :return: 项目列表
+        """
+        n = len(self.items)
+        eligible = self.eligible
+        if n <= 4 * k:
+            pool = [item for i, item in enumerate(self.items) if eligible[i]]
+            return rng.sample(pool, min(k, len(pool)))
+        chosen = {}
+        for _ in range(8 * k):
+            i = rng.randrange(n)
+            if eligible[i]:
+                chosen[i] = self.items[i]
+                if len(chosen) >= k:
+                    break
+        return list(chosen.values())
+
+
+class Cooldown:
+    """
+    最近K次抽取的冷却窗口：定长环形缓冲区加成员计数，入队、出队、查询均为O(1)
+    """
+
+    __slots__ = ('size', '_ring', '_pos', '_members')
+
+    def __init__(self, size):
+        """
+        :param size: 冷却次数K，0表示不冷却
+        """
+        self.size = max(0, int(size))
+        self._ring = [None] * self.size
+        self._pos = 0
+        self._members = {}  # 项目 -> 在缓冲区中出现的次数
+
+    def __contains__(self, item):
+        return item in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def push(self, item):
+        """记录一次抽取，挤出最早的一条记录"""
+        if not self.size:
+            return
+        members = self._members
+        old = self._ring[self._pos]
+        if old is not None:
+            count = members[old] - 1
+            if count:
+                members[old] = count
+            else:
+                del members[old]
+        self._ring[self._pos] = item
+        members[item] = members.get(item, 0) + 1
+        self._pos = (self._pos + 1) % self.size
+
+    def recent(self):
+        """按抽取先后返回缓冲区中的记录"""
+        ring = self._ring[self._pos:] + self._ring[:self._pos]
+        return [item for item in ring if item is not None]
+
+    def clear(self):
+        self._ring = [None] * self.size
+        self._pos = 0
+        self._members = {}
+
+    def load(self, recent):
+        """按抽取先后重新载入记录（只保留最近size条）"""
+        self.clear()
+        for item in recent[-self.size:] if self.size else ():
+            self.push(item)
+
+
+class Picker:
+    """
+    抽取器：在一个名单上按轮转或加权模式抽取
+    """
+
+    __slots__ = ('roster', 'mode', 'engine', 'cooldown')
+
+    def __init__(self, items, mode="rotation", sampler="fenwick", exclude=None, cooldown=None):
+        """
+        :param items: 项目列表（不可重复）
+        :param mode: 抽取模式，"rotation" 或 "weighted"
+        :param sampler: 加权模式使用的抽样算法，见samplers.WEIGHTED_SAMPLERS
+        :param exclude: 编译后的排除规则（见compile_exclude_rules）
+        :param cooldown: 冷却次数K，最近K次抽到的项目暂不参与抽取；None时使用模式默认值
+        """
+        self.roster = Roster(items, exclude)
+        self.mode = mode if mode in MODES else "rotation"
+        if self.mode == "weighted":
+            self.engine = WEIGHTED_SAMPLERS.get(sampler, FenwickSampler)(self.roster.items)
+        else:
+            self.engine = RotationDeck(self.roster.items)
+        self.cooldown = Cooldown(resolve_cooldown(cooldown, self.mode))
+        self._sync_exclusions()
+
+    def _sync_exclusions(self):
+        """把名单的排除状态同步到抽取引擎"""
+        engine = self.engine
+        mask = self.roster.excluded_mask()
+        if hasattr(engine, 'set_excluded_mask'):
+            engine.set_excluded_mask(mask)
+            return
+        for item, excluded in zip(self.roster.items, mask):
+            if excluded:
+                engine.exclude(item)
+            else:
+                engine.include(item)
+
+    def set_leave(self, leave):
+        """
+        整体设置请假名单，O(n)，用于初始化
+        :param leave: 请假人员的可迭代对象，可包含不在名单中的项目
+        """
+        self.roster.set_leave(leave)
+        self._sync_exclusions()
+
+    def update_leave(self, added=(), removed=()):
+        """
+        增量更新请假名单，只把变化的项目同步到抽取引擎
+        :param added: 新增的请假人员
+        :param removed: 销假的人员
+        """
+        engine = self.engine
+        for item, excluded in self.roster.update_leave(added, removed):
+            if excluded:
+                engine.exclude(item)
+            else:
+                engine.include(item)
+
+    @property
+    def last_selected(self):
+        """上一个抽到的项目"""
+        recent = self.cooldown.recent()
+        return recent[-1] if recent else None
+
+    def draw(self, rng=random):
+        """
+        抽取一项
+        冷却中的项目会被避开（除非只剩冷却中的项目），加权模式下抽中后权重减半
+        :param rng: 随机数生成器
+        :return: 选中的项目，没有可抽取项目时返回None
+        """
+        cooldown = self.cooldown
+        item = self.engine.draw(avoid=cooldown if len(cooldown) else (), rng=rng)
+        if item is not None:
+            if self.mode == "weighted":
+                self.engine.scale_weight(item, WEIGHT_DECAY)
+            cooldown.push(item)
+        return item
+
+    def draw_many(self, k, rng=random):
+        """
+        一次抽取k个不同的项目
+        :param k: 抽取数量
+        :param rng: 随机数生成器
+        :return: 选中的项目列表（可抽取数量不足时少于k个）
+        """
+        picked = self.engine.draw_many(k, avoid=tuple(self.cooldown), rng=rng)
+        if self.mode == "weighted":
+            for item in picked:
+                self.engine.scale_weight(item, WEIGHT_DECAY)
+        for item in picked:
+            self.cooldown.push(item)
+        return picked
+
+    def snapshot(self):
+        """
+        导出可持久化的抽取状态（牌堆位置/权重、冷却记录），与名单哈希绑定
+        :return: 可JSON序列化的字典
+        """
+        index = self.roster.index
+        state = {
+            "hash": self.roster.digest,
+            "mode": self.mode,
+            "cooldown": [index[item] for item in self.cooldown.recent()],
+        }
+        state.update(self.engine.get_state())
+        return state
+
+    def restore(self, state):
+        """
+        载入snapshot导出的抽取状态，O(n)
+        名单或抽取模式已变化时忽略该状态
+        :return: 是否成功载入
+        """
+        if not isinstance(state, dict):
+            return False
+        if state.get("hash") != self.roster.digest or state.get("mode") != self.mode:
+            return False
+        if not self.engine.load_state(state):
+            return False
+        items = self.roster.items
+        self.cooldown.load([items[i] for i in state.get("cooldown", [])
+                            if isinstance(i, int) and 0 <= i < len(items)])
+        self._sync_exclusions()
+        return True
+
+    def reset(self):
+        """重置抽取记忆：轮转模式重新洗牌，加权模式重置权重"""
+        if self.mode == "weighted":
+            self.engine.reset_weights()
+        else:
+            self.engine.reset()
+        self.cooldown.clear()
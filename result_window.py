@@ -0,0 +1,224 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 结果展示窗口池
+名字窗口和图片窗口只创建一次，之后每次抽取只更新文字、颜色和位置，
+通过withdraw/deiconify隐藏和显示，不再反复创建和销毁Toplevel；
+动图彩蛋由FramePlayer用单个after循环播放；
+多屏输出时每个屏幕区域使用各自的一组窗口，布局和图片只计算、解码一次
+"""
+
+import platform
+from tkinter import Toplevel, Label, Canvas, CENTER
+
+DISPLAY_FIELDS = ('x', 'y', 'width', 'height')
+
+
+def validate_displays(value):
+    """
+    检查多屏输出设置
+    :param value: 配置中的displays字段，每项为一个屏幕区域{"x", "y", "width", "height"}（像素）
+    :return: 错误信息列表
+    """
+    if not isinstance(value, list):
+        return ["displays必须为数组格式"]
+    errors = []
+    for i, region in enumerate(value, 1):
+        if not isinstance(region, dict):
+            errors.append(f"第{i}个屏幕区域必须为对象格式")
+            continue
+        for field in DISPLAY_FIELDS:
+            number = region.get(field)
+            if isinstance(number, bool) or not isinstance(number, int):
+                errors.append(f"第{i}个屏幕区域缺少整数字段{field}")
+            elif field in ('width', 'height') and number <= 0:
+                errors.append(f"第{i}个屏幕区域的{field}必须大于0")
+    return errors
+
+
+def region_geometry(width, height, region, top=False):
+    """
+    计算窗口在屏幕区域中的位置
+    :param width: 窗口宽度
+    :param height: 窗口高度
+    :param region: 屏幕区域(x, y, 宽, 高)
+    :param top: 是否贴着区域顶部（否则垂直居中）
+    :return: Tk几何字符串
+    """
+    region_x, region_y, region_width, region_height = region
+    x = region_x + (region_width - width) // 2
+    y = region_y if top else region_y + (region_height - height) // 2
+    return f"{width}x{height}+{x}+{y}"
+
+
+class PooledWindow:
+    """
+    池中的一个展示窗口（Toplevel加一个Label，名字窗口另有一个用于揭晓动画的Canvas）
+    """
+
+    __slots__ = ('toplevel', 'label', 'canvas', 'visible')
+
+    def __init__(self, toplevel, label, canvas=None):
+        self.toplevel = toplevel
+        self.label = label
+        self.canvas = canvas
+        self.visible = False
+
+    def show(self, geometry):
+        """
+        设置位置并显示窗口
+        :param geometry: Tk几何字符串，如"200x100+10+10"
+        """
+        self.toplevel.geometry(geometry)
+        self.toplevel.deiconify()
+        self.toplevel.attributes('-topmost', True)
+        self.visible = True
+
+    def hide(self):
+        """隐藏窗口（不销毁）"""
+        if self.visible:
+            self.toplevel.withdraw()
+            self.visible = False
+
+    def exists(self):
+        return bool(self.toplevel.winfo_exists())
+
+
+class ResultWindowPool:
+    """
+    展示窗口池：按需创建并复用名字窗口和图片窗口
+    """
+
+    def __init__(self, root, icon_path):
+        """
+        :param root: Tk根窗口
+        :param icon_path: 窗口图标路径
+        """
+        self.root = root
+        self.icon_path = icon_path
+        self.name_windows = []
+        self.image_windows = []
+
+    def _create_toplevel(self):
+        """创建一个已完成样式设置的隐藏窗口"""
+        window = Toplevel(self.root)
+        window.withdraw()
+        window.iconbitmap(self.icon_path)
+        window.title("随机抽签器")
+        window.attributes('-toolwindow', True)
+        # Windows系统设置工具窗口样式
+        if platform.system() == 'Windows':
+            import ctypes
+            hwnd = ctypes.windll.user32.GetParent(window.winfo_id())
+            GWL_EXSTYLE = -20
+            WS_EX_TOOLWINDOW = 0x00000080
+            ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, WS_EX_TOOLWINDOW)
+        window.overrideredirect(1)
+        window.attributes('-topmost', True)
+        window.attributes('-alpha', 1)
+        return window
+
+    def _get(self, windows, i, create):
+        # 窗口被意外关闭（例如被系统销毁）时重新创建
+        while len(windows) <= i:
+            windows.append(None)
+        slot = windows[i]
+        if slot is None or not slot.exists():
+            slot = create()
+            windows[i] = slot
+        return slot
+
+    def name_window(self, i=0):
+        """
+        获取第i个名字窗口
+        """
+        def create():
+            window = self._create_toplevel()
+            label = Label(window, justify=CENTER)
+            label.place(relx=0.5, rely=0.5, anchor=CENTER)
+            # 揭晓动画时覆盖在标签上方，平时不显示
+            canvas = Canvas(window, highlightthickness=0, bg=label.cget('bg'))
+            return PooledWindow(window, label, canvas)
+        return self._get(self.name_windows, i, create)
+
+    def image_window(self, i=0):
+        """
+        获取第i个图片窗口
+        """
+        def create():
+            window = self._create_toplevel()
+            label = Label(window, borderwidth=0)
+            label.pack()
+            return PooledWindow(window, label)
+        return self._get(self.image_windows, i, create)
+
+    def prewarm(self, count=1):
+        """预先创建count组名字窗口和图片窗口"""
+        for i in range(count):
+            self.name_window(i)
+            self.image_window(i)
+
+    def hide_all(self):
+        """隐藏所有展示窗口"""
+        for slot in self.name_windows + self.image_windows:
+            if slot is not None and slot.exists():
+                slot.hide()
+
+    def any_visible(self):
+        return any(slot is not None and slot.visible for slot in self.name_windows + self.image_windows)
+
+
+class FramePlayer:
+    """
+    动图播放器：同一时间只有一个after循环，切换图片或关闭窗口时停止
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._labels = None
+        self._photos = None
+        self._durations = None
+        self._index = 0
+        self._job = None
+
+    @property
+    def playing(self):
+        return self._job is not None
+
+    def play(self, labels, photos, durations):
+        """
+        在标签上循环播放帧（多屏输出时所有标签共用同一组帧和同一个循环）
+        :param labels: 展示图片的Label列表
+        :param photos: 每帧的Tk图片
+        :param durations: 每帧时长（毫秒）
+        """
+        self.stop()
+        self._labels = list(labels)
+        self._photos = photos
+        self._durations = durations
+        self._index = 0
+        self._job = self.root.after(durations[0], self._tick)
+
+    def stop(self):
+        """停止播放并释放对帧的引用"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self._labels = None
+        self._photos = None
+        self._durations = None
+
+    def _tick(self):
+        self._job = None
+        # 窗口已被销毁时不再继续调度
+        labels = [label for label in self._labels or () if label.winfo_exists()]
+        if not labels:
+            self.stop()
+            return
+        self._labels = labels
+        self._index = (self._index + 1) % len(self._photos)
+        for label in labels:
+            label.config(image=self._photos[self._index])
+        self._job = self.root.after(self._durations[self._index], self._tick)
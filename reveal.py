@@ -0,0 +1,173 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 揭晓动画
+名字揭晓前的"老虎机"滚动效果：候选名字在Canvas上各创建一次文字对象，之后只切换显示状态；
+帧调度使用固定时间步长，机器卡顿时直接丢帧而不是越拖越慢。
+最终结果在动画开始前已由抽取器确定，动画只负责展示
+"""
+
+import time
+
+DEFAULT_REVEAL_ANIMATION = {"enabled": False, "duration": 1.5, "fps": 30}
+REVEAL_CANDIDATES = 24  # 参与滚动的候选名字数量上限
+MAX_REEL_ITEMS = 512    # 滚轮缓存的文字对象数量上限
+
+
+def validate_reveal_animation(value):
+    """
+    检查揭晓动画设置
+    :param value: 配置中的reveal_animation字段
+    :return: 错误信息列表
+    """
+    if not isinstance(value, dict):
+        return ["reveal_animation必须为对象格式"]
+    errors = []
+    if not isinstance(value.get('enabled', False), bool):
+        errors.append("reveal_animation的enabled必须为true或false")
+    duration = value.get('duration', DEFAULT_REVEAL_ANIMATION['duration'])
+    if isinstance(duration, bool) or not isinstance(duration, (int, float)) or not 0 < duration <= 10:
+        errors.append(f"reveal_animation的duration必须为0到10之间的秒数: {duration}")
+    fps = value.get('fps', DEFAULT_REVEAL_ANIMATION['fps'])
+    if isinstance(fps, bool) or not isinstance(fps, int) or not 1 <= fps <= 120:
+        errors.append(f"reveal_animation的fps必须为1到120之间的整数: {fps}")
+    return errors
+
+
+class FrameScheduler:
+    """
+    固定时间步长的帧调度器
+    第i帧应在 开始时间 + i * 步长 时绘制；回调执行慢于步长时跳过落后的帧，总时长保持不变
+    """
+
+    def __init__(self, root, fps, duration, on_frame, on_done):
+        """
+        :param root: Tk根窗口
+        :param fps: 每秒帧数
+        :param duration: 总时长（秒）
+        :param on_frame: 绘制回调 on_frame(帧序号, 总帧数)
+        :param on_done: 结束回调（正常结束时调用，取消时不调用）
+        """
+        self.root = root
+        self.step = 1.0 / fps
+        self.total = max(1, int(round(duration * fps)))
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.dropped = 0
+        self._start = None
+        self._last = -1
+        self._job = None
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._last = -1
+        self._job = self.root.after_idle(self._tick)
+
+    def cancel(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        frame = int((time.perf_counter() - self._start) / self.step)
+        if frame >= self.total:
+            self._job = None
+            self.on_done()
+            return
+        if frame > self._last + 1:
+            self.dropped += frame - self._last - 1
+        if frame != self._last:
+            self.on_frame(frame, self.total)
+            self._last = frame
+        # 按下一帧的计划时间调度，而不是按固定间隔累加
+        delay = self._start + (frame + 1) * self.step - time.perf_counter()
+        self._job = self.root.after(max(1, int(delay * 1000)), self._tick)
+
+
+class TextReel:
+    """
+    Canvas上的名字滚轮：每个(文字, 字体, 颜色)只创建一个文字对象并缓存，切换时只修改显示状态
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._items = {}
+        self._current = None
+
+    def show(self, text, text_font, color):
+        key = (text, text_font, color)
+        item = self._items.get(key)
+        if item is None:
+            if len(self._items) >= MAX_REEL_ITEMS:
+                # 名单很大时定期清空缓存，避免Canvas中的文字对象无限增长
+                self.clear()
+                self.canvas.delete(*self._items.values())
+                self._items.clear()
+            item = self.canvas.create_text(0, 0, text=text, font=text_font, fill=color, state='hidden')
+            self._items[key] = item
+        if item == self._current:
+            return
+        if self._current is not None:
+            self.canvas.itemconfigure(self._current, state='hidden')
+        self.canvas.coords(item, self.canvas.winfo_width() // 2, self.canvas.winfo_height() // 2)
+        self.canvas.itemconfigure(item, state='normal')
+        self._current = item
+
+    def clear(self):
+        if self._current is not None:
+            self.canvas.itemconfigure(self._current, state='hidden')
+            self._current = None
+
+
+class SlotMachineReveal:
+    """
+    老虎机式揭晓动画：候选名字先快后慢地滚动，最后停在已确定的结果上
+    """
+
+    def __init__(self, root, reel, candidates, final, text_font, color, duration, fps, on_done):
+        """
+        :param root: Tk根窗口
+        :param reel: 展示用的TextReel
+        :param candidates: 滚动时出现的候选名字
+        :param final: 最终结果（动画开始前已确定）
+        :param text_font: 字体
+        :param color: 文字颜色
+        :param duration: 动画时长（秒）
+        :param fps: 每秒帧数
+        :param on_done: 动画结束后的回调
+        """
+        self.reel = reel
+        self.final = final
+        self.text_font = text_font
+        self.color = color
+        self.on_done = on_done
+        # 滚动序列：候选名字循环排列，末尾为最终结果
+        spins = max(1, int(duration * fps * 0.6))
+        candidates = list(candidates) or [final]
+        self.sequence = [candidates[i % len(candidates)] for i in range(spins)] + [final]
+        self.scheduler = FrameScheduler(root, fps, duration, self._frame, self._finish)
+
+    def start(self):
+        self.scheduler.start()
+
+    def cancel(self):
+        """中止动画（不调用结束回调）"""
+        self.scheduler.cancel()
+        self.reel.clear()
+
+    def _frame(self, frame, total):
+        # 三次缓出：开始滚动快，接近结束时逐渐变慢
+        t = frame / total
+        progress = 1 - (1 - t) ** 3
+        index = int(progress * (len(self.sequence) - 1))
+        self.reel.show(self.sequence[index], self.text_font, self.color)
+
+    def _finish(self):
+        self.reel.show(self.final, self.text_font, self.color)
+        self.on_done()
@@ -0,0 +1,723 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 抽取算法
+本模块不依赖tkinter/pygame，可在无界面环境下导入和测试
+"""
+
+import heapq
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖，未安装时使用纯Python实现
+    np = None
+
+
+def weighted_sample_k(pairs, k, avoid=(), rng=random):
+    """
+    加权无放回抽取k个不同项目（Efraimidis–Spirakis加权蓄水池抽样）
+    单次遍历，每项的键为log(u)/w，取键最大的k项，O(n log k)
+    :param pairs: (项目, 权重)的可迭代对象，权重<=0的项目不参与
+    :param k: 抽取数量
+    :param avoid: 尽量避开的项目，仅当其余项目不足k个时才会被选中
+    :param rng: 随机数生成器
+    :return: 选中的项目列表，按抽中先后排序
+    """
+    avoid = set(avoid)
+    keyed = (
+        (item not in avoid, math.log(1.0 - rng.random()) / weight, item)
+        for item, weight in pairs if weight > 0
+    )
+    return [item for _, _, item in heapq.nlargest(k, keyed, key=lambda t: (t[0], t[1]))]
+
+
+class FenwickSampler:
+    """
+    基于树状数组（Fenwick树）的加权抽样器
+    抽取、修改权重、排除/恢复某一项均为O(log n)
+    """
+
+    __slots__ = ('items', 'index', '_weights', '_excluded', '_tree', '_size', '_top', '_updates')
+
+    def __init__(self, items, weight=1.0):
+        """
+        :param items: 项目列表（不可重复）
+        :param weight: 初始权重
+        """
+        self.items = list(items)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self._size = len(self.items)
+        self._weights = [float(weight)] * self._size  # 基础权重（排除时保留）
+        self._excluded = bytearray(self._size)        # 排除标记（请假、特殊标记等）
+        self._top = 1
+        while self._top * 2 <= self._size:
+            self._top *= 2
+        self._rebuild()
+
+    def _rebuild(self):
+        """O(n)重建树，同时消除浮点累计误差"""
+        n = self._size
+        tree = [0.0] * (n + 1)
+        for i in range(n):
+            if not self._excluded[i]:
+                tree[i + 1] = self._weights[i]
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._updates = 0
+
+    def _add(self, i, delta):
+        """在第i项（0起）上增加delta"""
+        tree = self._tree
+        n = self._size
+        i += 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+        self._updates += 1
+        # 更新次数达到n次时重建一次，均摊O(1)，避免浮点漂移
+        if self._updates > n:
+            self._rebuild()
+
+    def _effective(self, i):
+        return 0.0 if self._excluded[i] else self._weights[i]
+
+    @property
+    def total(self):
+        """当前可抽取项目的权重总和"""
+        total = 0.0
+        i = self._size
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def weight(self, item):
+        """获取项目的基础权重"""
+        return self._weights[self.index[item]]
+
+    def set_weight(self, item, weight):
+        """设置项目的基础权重"""
+        i = self.index[item]
+        old = self._effective(i)
+        self._weights[i] = float(weight)
+        new = self._effective(i)
+        if new != old:
+            self._add(i, new - old)
+
+    def scale_weight(self, item, factor):
+        """将项目权重乘以factor（例如抽中后减半）"""
+        i = self.index[item]
+        self.set_weight(item, self._weights[i] * factor)
+
+    def exclude(self, item):
+        """排除项目（权重保留，恢复后继续生效）"""
+        i = self.index.get(item)
+        if i is None or self._excluded[i]:
+            return
+        self._excluded[i] = 1
+        self._add(i, -self._weights[i])
+
+    def include(self, item):
+        """恢复被排除的项目"""
+        i = self.index.get(item)
+        if i is None or not self._excluded[i]:
+            return
+        self._excluded[i] = 0
+        self._add(i, self._weights[i])
+
+    def is_excluded(self, item):
+        return bool(self._excluded[self.index[item]])
+
+    def reset_weights(self, weight=1.0):
+        """重置全部权重，保留排除状态"""
+        self._weights = [float(weight)] * self._size
+        self._rebuild()
+
+    def get_state(self):
+        """导出可持久化的状态（与items下标对齐的权重）"""
+        return {"weights": list(self._weights)}
+
+    def load_state(self, state):
+        """
+        载入get_state导出的状态，O(n)
+        :return: 状态与当前名单不匹配时返回False
+        """
+        weights = state.get("weights")
+        if not isinstance(weights, list) or len(weights) != self._size:
+            return False
+        self._weights = [float(w) for w in weights]
+        self._rebuild()
+        return True
+
+    def _find(self, r):
+        """找到前缀和首次超过r的位置（0起）"""
+        tree = self._tree
+        n = self._size
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= r:
+                pos = nxt
+                r -= tree[nxt]
+            step >>= 1
+        return pos
+
+    def _draw_once(self, rng):
+        total = self.total
+        if total <= 0 or self._size == 0:
+            return None
+        for _ in range(3):
+            i = self._find(rng.random() * total)
+            if i < self._size and self._effective(i) > 0:
+                return i
+            # 浮点误差导致落在边界或零权重项上，重建后重试
+            self._rebuild()
+            total = self.total
+            if total <= 0:
+                return None
+        return None
+
+    def draw(self, avoid=(), rng=random):
+        """
+        加权抽取一项
+        :param avoid: 本次临时避开的项目（如上一个抽到的人），
+                      若避开后无可抽项目则忽略此参数
+        :param rng: 随机数生成器
+        :return: 选中的项目，没有可抽取项目时返回None
+        """
+        avoided = []
+        for item in avoid:
+            i = self.index.get(item)
+            if i is not None and not self._excluded[i]:
+                self.exclude(item)
+                avoided.append(item)
+        try:
+            i = self._draw_once(rng)
+        finally:
+            for item in avoided:
+                self.include(item)
+        if i is None and avoided:
+            i = self._draw_once(rng)
+        return None if i is None else self.items[i]
+
+    def draw_many(self, k, avoid=(), rng=random):
+        """
+        加权无放回抽取k个不同项目
+        :param k: 抽取数量（超过可抽取数量时返回全部可抽取项目）
+        :param avoid: 尽量避开的项目
+        :param rng: 随机数生成器
+        :return: 选中的项目列表
+        """
+        excluded = self._excluded
+        weights = self._weights
+        pairs = ((item, weights[i]) for i, item in enumerate(self.items) if not excluded[i])
+        return weighted_sample_k(pairs, k, avoid, rng)
+
+
+class RotationDeck:
+    """
+    轮转抽取牌堆
+    每轮开始时洗牌一次（Fisher–Yates），之后从末尾O(1)弹出；
+    被排除的项目会被移出牌堆暂存，恢复时随机插回，抽取始终为O(1)
+    """
+
+    __slots__ = ('items', 'index', '_deck', '_pos', '_excluded', '_parked')
+
+    def __init__(self, items):
+        """
+        :param items: 项目列表（不可重复）
+        """
+        self.items = list(items)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        n = len(self.items)
+        self._excluded = bytearray(n)  # 排除标记
+        self._parked = bytearray(n)    # 本轮尚未抽到但因排除而暂存的项目
+        self._deck = []
+        self._pos = [-1] * n           # 项目在牌堆中的位置，-1表示不在牌堆中
+        self.reset()
+
+    def reset(self, rng=random):
+        """开始新的一轮：所有未排除的项目重新洗牌入堆"""
+        excluded = self._excluded
+        deck = [i for i in range(len(self.items)) if not excluded[i]]
+        # Fisher–Yates洗牌
+        for j in range(len(deck) - 1, 0, -1):
+            k = rng.randrange(j + 1)
+            deck[j], deck[k] = deck[k], deck[j]
+        pos = [-1] * len(self.items)
+        for p, i in enumerate(deck):
+            pos[i] = p
+        self._deck = deck
+        self._pos = pos
+        self._parked = bytearray(excluded)
+
+    @property
+    def remaining(self):
+        """本轮剩余可抽取的数量"""
+        return len(self._deck)
+
+    def get_state(self):
+        """导出可持久化的状态（本轮剩余牌堆顺序和暂存项目的下标）"""
+        return {
+            "deck": list(self._deck),
+            "parked": [i for i, parked in enumerate(self._parked) if parked],
+        }
+
+    def load_state(self, state):
+        """
+        载入get_state导出的状态，O(n)
+        暂存项目按被排除处理，调用方随后应重新同步排除状态
+        :return: 状态与当前名单不匹配时返回False
+        """
+        n = len(self.items)
+        deck = state.get("deck")
+        parked = state.get("parked", [])
+        if not isinstance(deck, list) or not isinstance(parked, list):
+            return False
+        seen = bytearray(n)
+        for i in deck + parked:
+            if not isinstance(i, int) or not 0 <= i < n or seen[i]:
+                return False
+            seen[i] = 1
+        pos = [-1] * n
+        for p, i in enumerate(deck):
+            pos[i] = p
+        self._deck = list(deck)
+        self._pos = pos
+        self._parked = bytearray(n)
+        self._excluded = bytearray(n)
+        for i in parked:
+            self._parked[i] = 1
+            self._excluded[i] = 1
+        return True
+
+    def _remove_at(self, p):
+        """将牌堆位置p的项目与末尾交换后移除，O(1)"""
+        deck = self._deck
+        pos = self._pos
+        i = deck[p]
+        last = deck.pop()
+        if last != i:
+            deck[p] = last
+            pos[last] = p
+        pos[i] = -1
+        return i
+
+    def exclude(self, item):
+        """排除项目：若本轮尚未抽到，则移出牌堆暂存"""
+        i = self.index.get(item)
+        if i is None or self._excluded[i]:
+            return
+        self._excluded[i] = 1
+        if self._pos[i] >= 0:
+            self._remove_at(self._pos[i])
+            self._parked[i] = 1
+
+    def include(self, item, rng=random):
+        """恢复项目：若本轮尚未抽到，则随机插回牌堆"""
+        i = self.index.get(item)
+        if i is None or not self._excluded[i]:
+            return
+        self._excluded[i] = 0
+        if self._parked[i]:
+            self._parked[i] = 0
+            deck = self._deck
+            pos = self._pos
+            deck.append(i)
+            p = rng.randrange(len(deck))
+            other = deck[p]
+            deck[p], deck[-1] = i, other
+            pos[other] = len(deck) - 1
+            pos[i] = p
+
+    def is_excluded(self, item):
+        return bool(self._excluded[self.index[item]])
+
+    def draw(self, avoid=(), rng=random):
+        """
+        抽取一项，本轮抽完后自动开始新的一轮
+        :param avoid: 本次临时避开的项目（如冷却中的项目），
+                      只检查牌堆末尾的len(avoid)+1张，O(K)；全部避开时忽略此参数
+        :param rng: 随机数生成器
+        :return: 选中的项目，所有项目都被排除时返回None
+        """
+        if not self._deck:
+            self.reset(rng)
+            if not self._deck:
+                return None
+        if avoid:
+            self._avoid_top({self.index[item] for item in avoid if item in self.index})
+        i = self._deck.pop()
+        self._pos[i] = -1
+        return self.items[i]
+
+    def _avoid_top(self, avoid_idx):
+        """牌堆末尾的牌需要避开时，与末尾之前第一张不需避开的牌交换，O(len(avoid_idx))"""
+        deck = self._deck
+        if deck[-1] in avoid_idx:
+            # 牌堆顺序是随机的，与末尾之前第一张不需避开的牌交换即可
+            for p in range(len(deck) - 2, max(-1, len(deck) - 2 - len(avoid_idx)), -1):
+                if deck[p] not in avoid_idx:
+                    last = deck[-1]
+                    deck[-1], deck[p] = deck[p], last
+                    self._pos[last] = p
+                    break
+
+    def draw_many(self, k, avoid=(), rng=random):
+        """
+        连续抽取k个不同项目，本轮不足时开始新的一轮并跳过本批已抽到的项目
+        :param k: 抽取数量（超过可抽取数量时返回全部可抽取项目）
+        :param avoid: 本批临时避开的项目（如冷却中的项目），同draw
+        :param rng: 随机数生成器
+        :return: 选中的项目列表
+        """
+        avoid_idx = {self.index[item] for item in avoid if item in self.index}
+        picked = []
+        while len(picked) < k:
+            if not self._deck:
+                self.reset(rng)
+                # 本批已抽到的项目在新一轮中视为已抽过
+                for item in picked:
+                    p = self._pos[self.index[item]]
+                    if p >= 0:
+                        self._remove_at(p)
+                if not self._deck:
+                    break
+            if avoid_idx:
+                self._avoid_top(avoid_idx)
+            i = self._deck.pop()
+            self._pos[i] = -1
+            picked.append(self.items[i])
+        return picked
+
+
+class AliasSampler:
+    """
+    基于Vose别名法的加权抽样器
+    适合权重很少变化的场景：抽取为O(1)，修改权重或排除状态只标记为脏，
+    下一次抽取时才以O(n)重建别名表。
+    抽签器的加权模式每次抽中后都会减半权重，每次抽取都要重建，因此不在WEIGHTED_SAMPLERS中提供，
+    仅供权重固定的调用方直接使用
+    """
+
+    __slots__ = ('items', 'index', '_weights', '_excluded', '_prob', '_alias', '_live', '_total', '_dirty')
+
+    def __init__(self, items, weight=1.0):
+        """
+        :param items: 项目列表（不可重复）
+        :param weight: 初始权重
+        """
+        self.items = list(items)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self._weights = [float(weight)] * len(self.items)
+        self._excluded = bytearray(len(self.items))
+        self._prob = []
+        self._alias = []
+        self._live = []   # 参与抽取的项目下标
+        self._total = 0.0
+        self._dirty = True
+
+    def _build(self):
+        """O(n)构建别名表"""
+        weights = self._weights
+        excluded = self._excluded
+        live = [i for i in range(len(self.items)) if not excluded[i] and weights[i] > 0]
+        total = sum(weights[i] for i in live)
+        n = len(live)
+        prob = [0.0] * n
+        alias = [0] * n
+        if n:
+            scaled = [weights[i] * n / total for i in live]
+            small = [k for k in range(n) if scaled[k] < 1.0]
+            large = [k for k in range(n) if scaled[k] >= 1.0]
+            while small and large:
+                s = small.pop()
+                l = large.pop()
+                prob[s] = scaled[s]
+                alias[s] = l
+                scaled[l] = (scaled[l] + scaled[s]) - 1.0
+                if scaled[l] < 1.0:
+                    small.append(l)
+                else:
+                    large.append(l)
+            # 剩余项概率为1（浮点误差导致的残留也按1处理）
+            for k in large:
+                prob[k] = 1.0
+            for k in small:
+                prob[k] = 1.0
+        self._prob = prob
+        self._alias = alias
+        self._live = live
+        self._total = total
+        self._dirty = False
+
+    @property
+    def total(self):
+        """当前可抽取项目的权重总和"""
+        if self._dirty:
+            self._build()
+        return self._total
+
+    def weight(self, item):
+        """获取项目的基础权重"""
+        return self._weights[self.index[item]]
+
+    def set_weight(self, item, weight):
+        """设置项目的基础权重（别名表延迟重建）"""
+        self._weights[self.index[item]] = float(weight)
+        self._dirty = True
+
+    def scale_weight(self, item, factor):
+        """将项目权重乘以factor（例如抽中后减半）"""
+        i = self.index[item]
+        self._weights[i] *= factor
+        self._dirty = True
+
+    def exclude(self, item):
+        """排除项目（权重保留，恢复后继续生效）"""
+        i = self.index.get(item)
+        if i is None or self._excluded[i]:
+            return
+        self._excluded[i] = 1
+        self._dirty = True
+
+    def include(self, item):
+        """恢复被排除的项目"""
+        i = self.index.get(item)
+        if i is None or not self._excluded[i]:
+            return
+        self._excluded[i] = 0
+        self._dirty = True
+
+    def is_excluded(self, item):
+        return bool(self._excluded[self.index[item]])
+
+    def reset_weights(self, weight=1.0):
+        """重置全部权重，保留排除状态"""
+        self._weights = [float(weight)] * len(self.items)
+        self._dirty = True
+
+    def get_state(self):
+        """导出可持久化的状态（与items下标对齐的权重）"""
+        return {"weights": list(self._weights)}
+
+    def load_state(self, state):
+        """
+        载入get_state导出的状态
+        :return: 状态与当前名单不匹配时返回False
+        """
+        weights = state.get("weights")
+        if not isinstance(weights, list) or len(weights) != len(self.items):
+            return False
+        self._weights = [float(w) for w in weights]
+        self._dirty = True
+        return True
+
+    def _draw_once(self, rng):
+        n = len(self._live)
+        u = rng.random() * n
+        k = int(u)
+        if k >= n:
+            k = n - 1
+        if u - k >= self._prob[k]:
+            k = self._alias[k]
+        return self._live[k]
+
+    def draw(self, avoid=(), rng=random):
+        """
+        加权抽取一项，O(1)
+        :param avoid: 本次临时避开的项目（如上一个抽到的人），
+                      若避开后无可抽项目则忽略此参数
+        :param rng: 随机数生成器
+        :return: 选中的项目，没有可抽取项目时返回None
+        """
+        if self._dirty:
+            self._build()
+        if not self._live:
+            return None
+        avoid_idx = {self.index[item] for item in avoid if item in self.index}
+        if not avoid_idx:
+            return self.items[self._draw_once(rng)]
+        # 拒绝采样：避开的项目通常只占很小的权重
+        for _ in range(32):
+            i = self._draw_once(rng)
+            if i not in avoid_idx:
+                return self.items[i]
+        # 避开的项目几乎占满全部权重时，退化为线性扫描
+        weights = self._weights
+        rest = [i for i in self._live if i not in avoid_idx]
+        if not rest:
+            return self.items[self._draw_once(rng)]
+        r = rng.random() * sum(weights[i] for i in rest)
+        for i in rest:
+            r -= weights[i]
+            if r < 0:
+                return self.items[i]
+        return self.items[rest[-1]]
+
+    def draw_many(self, k, avoid=(), rng=random):
+        """
+        加权无放回抽取k个不同项目
+        :param k: 抽取数量（超过可抽取数量时返回全部可抽取项目）
+        :param avoid: 尽量避开的项目
+        :param rng: 随机数生成器
+        :return: 选中的项目列表
+        """
+        if self._dirty:
+            self._build()
+        weights = self._weights
+        items = self.items
+        return weighted_sample_k(((items[i], weights[i]) for i in self._live), k, avoid, rng)
+
+
+class NumpySampler:
+    """
+    基于NumPy向量化运算的加权抽样器
+    名单、权重和排除标记均为下标对齐的数组，过滤、归一化与抽样均为向量化运算。
+    单次抽取每次都要对整个数组求前缀和（O(n)，并分配两个n长数组），远慢于FenwickSampler的O(log n)；
+    优势只在于批量抽取（draw_many）一次向量化完成，适合单次抽取大量项目的场景
+    """
+
+    __slots__ = ('items', 'index', '_weights', '_excluded')
+
+    def __init__(self, items, weight=1.0):
+        """
+        :param items: 项目列表（不可重复）
+        :param weight: 初始权重
+        """
+        self.items = list(items)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self._weights = np.full(len(self.items), float(weight), dtype=np.float64)
+        self._excluded = np.zeros(len(self.items), dtype=bool)
+
+    def _live_weights(self, avoid=()):
+        """返回排除后的权重数组（被排除或避开的项目权重为0）"""
+        live = np.where(self._excluded, 0.0, self._weights)
+        if avoid:
+            idx = [self.index[item] for item in avoid if item in self.index]
+            if idx:
+                live[idx] = 0.0
+        return live
+
+    @property
+    def total(self):
+        """当前可抽取项目的权重总和"""
+        return float(self._live_weights().sum())
+
+    def weight(self, item):
+        """获取项目的基础权重"""
+        return float(self._weights[self.index[item]])
+
+    def set_weight(self, item, weight):
+        """设置项目的基础权重"""
+        self._weights[self.index[item]] = weight
+
+    def scale_weight(self, item, factor):
+        """将项目权重乘以factor（例如抽中后减半）"""
+        self._weights[self.index[item]] *= factor
+
+    def exclude(self, item):
+        """排除项目（权重保留，恢复后继续生效）"""
+        i = self.index.get(item)
+        if i is not None:
+            self._excluded[i] = True
+
+    def include(self, item):
+        """恢复被排除的项目"""
+        i = self.index.get(item)
+        if i is not None:
+            self._excluded[i] = False
+
+    def set_excluded_mask(self, mask):
+        """
+        以布尔数组整体设置排除状态
+        :param mask: 与items下标对齐的布尔数组，True表示排除
+        """
+        self._excluded = np.asarray(mask, dtype=bool).copy()
+
+    def is_excluded(self, item):
+        return bool(self._excluded[self.index[item]])
+
+    def reset_weights(self, weight=1.0):
+        """重置全部权重，保留排除状态"""
+        self._weights.fill(float(weight))
+
+    def get_state(self):
+        """导出可持久化的状态（与items下标对齐的权重）"""
+        return {"weights": self._weights.tolist()}
+
+    def load_state(self, state):
+        """
+        载入get_state导出的状态
+        :return: 状态与当前名单不匹配时返回False
+        """
+        weights = state.get("weights")
+        if not isinstance(weights, list) or len(weights) != len(self.items):
+            return False
+        self._weights = np.asarray(weights, dtype=np.float64)
+        return True
+
+    def _draw_once(self, live, rng):
+        cumulative = np.cumsum(live)
+        total = cumulative[-1] if len(cumulative) else 0.0
+        if total <= 0:
+            return None
+        i = int(np.searchsorted(cumulative, rng.random() * total, side='right'))
+        return min(i, len(cumulative) - 1)
+
+    def draw(self, avoid=(), rng=random):
+        """
+        加权抽取一项
+        :param avoid: 本次临时避开的项目，若避开后无可抽项目则忽略此参数
+        :param rng: 随机数生成器
+        :return: 选中的项目，没有可抽取项目时返回None
+        """
+        i = self._draw_once(self._live_weights(avoid), rng)
+        if i is None and avoid:
+            i = self._draw_once(self._live_weights(), rng)
+        return None if i is None else self.items[i]
+
+    def draw_many(self, k, avoid=(), rng=random):
+        """
+        加权无放回抽取k个不同项目（向量化的Efraimidis–Spirakis抽样）
+        :param k: 抽取数量（超过可抽取数量时返回全部可抽取项目）
+        :param avoid: 尽量避开的项目
+        :param rng: 随机数生成器
+        :return: 选中的项目列表
+        """
+        live = self._live_weights()
+        eligible = live > 0
+        count = int(eligible.sum())
+        k = min(k, count)
+        if k <= 0:
+            return []
+        # 使用random模块生成种子，保证重设随机种子对本抽样器同样生效
+        uniforms = np.random.default_rng(rng.getrandbits(64)).random(len(live))
+        keys = np.full(len(live), -np.inf)
+        with np.errstate(divide='ignore'):
+            keys[eligible] = np.log1p(-uniforms[eligible]) / live[eligible]
+        if avoid:
+            idx = [self.index[item] for item in avoid if item in self.index and eligible[self.index[item]]]
+            # 其余项目足够时才避开
+            if idx and count - len(idx) >= k:
+                keys[idx] = -np.inf
+        top = np.argpartition(-keys, k - 1)[:k]
+        top = top[np.argsort(-keys[top])]
+        return [self.items[i] for i in top]
+
+
+# 配置文件中weighted_sampler字段可选的加权抽样算法
+WEIGHTED_SAMPLERS = {
+    "fenwick": FenwickSampler,
+}
+if np is not None:
+    WEIGHTED_SAMPLERS["numpy"] = NumpySampler
@@ -0,0 +1,112 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 抽取状态持久化
+把轮转进度、权重、冷却记录和请假名单写入紧凑的快照文件，
+重启程序、崩溃或重启电脑后可以从上次的抽取进度继续
+"""
+
+import json
+import os
+import threading
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(config_path):
+    """
+    获取配置文件对应的快照文件路径（与配置文件同目录）
+    :param config_path: 配置文件路径
+    """
+    base, _ = os.path.splitext(os.path.abspath(config_path))
+    return base + ".state.json"
+
+
+def write_snapshot(path, state):
+    """
+    原子写入快照：先写临时文件并刷盘，再重命名覆盖，避免写到一半时崩溃留下损坏的文件
+    :param path: 快照文件路径
+    :param state: 可JSON序列化的状态字典
+    """
+    data = dict(state, version=SNAPSHOT_VERSION)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """
+    读取快照文件
+    :param path: 快照文件路径
+    :return: 状态字典，文件不存在、损坏或版本不符时返回None
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"[WARN] 读取抽取状态快照失败: {e}")
+        return None
+    if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+        return None
+    return data
+
+
+class SnapshotWriter:
+    """
+    后台快照写入线程
+    提交的状态只保留最新一份，由后台线程序列化并写盘，不占用点击响应的时间
+    """
+
+    def __init__(self, path):
+        """
+        :param path: 快照文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()        # 保护_pending，持有时间极短
+        self._write_lock = threading.Lock()  # 保证同一时间只有一次写盘
+        self._pending = None
+        self._event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, state):
+        """提交一份待写入的状态（覆盖尚未写入的旧状态）"""
+        with self._lock:
+            self._pending = state
+        self._event.set()
+
+    def flush(self, state=None):
+        """
+        在当前线程立即写入（退出或重启程序前调用）
+        :param state: 要写入的状态，None表示写入尚未写盘的状态
+        """
+        with self._write_lock:
+            with self._lock:
+                if state is None:
+                    state = self._pending
+                self._pending = None
+            if state is not None:
+                self._write(state)
+
+    def _write(self, state):
+        try:
+            write_snapshot(self.path, state)
+        except Exception as e:
+            print(f"[ERROR] 写入抽取状态快照失败: {e}")
+
+    def _run(self):
+        while True:
+            self._event.wait()
+            self._event.clear()
+            with self._write_lock:
+                with self._lock:
+                    state = self._pending
+                    self._pending = None
+                if state is not None:
+                    self._write(state)
@@ -0,0 +1,360 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 姓名朗读
+常驻的朗读线程只初始化一次语音引擎并选择一次语音，之后从有界队列中取出朗读请求；
+新的抽取开始时可以中止正在进行的朗读，引擎出错后才重新初始化。
+空闲时朗读线程把彩蛋文字和（不太大的）名单预先合成为WAV文件，抽到时直接播放，未命中时才实时合成；
+缓存目录有大小上限，每轮预合成开始时先删除不再需要的旧音频
+"""
+
+import hashlib
+import json
+import os
+import platform
+import queue
+import threading
+import time
+from collections import deque
+
+import pyttsx4
+
+from timing import NO_TIMINGS
+
+SPEECH_RATE = 150
+SPEECH_VOLUME = 0.9
+SPEECH_QUEUE_SIZE = 4
+DEFAULT_PRERENDER_LIMIT = 1000                 # 名单和小组总数不超过此数量时才预合成名单
+DEFAULT_SPEECH_CACHE_BYTES = 256 * 1024 * 1024  # 预合成音频缓存目录的大小上限
+
+
+def select_voice(engine):
+    """
+    选择中文语音
+    :param engine: 语音引擎
+    :return: 语音ID
+    """
+    if platform.system() == 'Windows':
+        voices = engine.getProperty('voices')
+        chinese_voices = [v for v in voices if 'Chinese' in v.name]
+        if not chinese_voices:
+            raise Exception("未找到中文语音包")
+        return chinese_voices[0].id
+    elif platform.system() == 'Darwin':
+        return 'com.apple.speech.synthesis.voice.ting-ting.premium'
+    else:  # Linux
+        return 'chinese'
+
+
+def create_engine():
+    """
+    创建并配置语音引擎（语音、语速、音量）
+    """
+    engine = pyttsx4.init()
+    engine.setProperty('voice', select_voice(engine))
+    engine.setProperty('rate', SPEECH_RATE)
+    engine.setProperty('volume', SPEECH_VOLUME)
+    return engine
+
+
+def clip_key(text, voice, rate, volume):
+    """
+    预合成音频的缓存键：文字、语音、语速、音量任一变化都会得到新的文件
+    """
+    data = json.dumps([text, voice, rate, volume], ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class SpeechClipCache:
+    """
+    预先合成的朗读音频缓存（目录中的WAV文件，文件名为缓存键）
+    查找只访问内存中的索引，不访问文件系统
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_SPEECH_CACHE_BYTES):
+        """
+        :param directory: 缓存目录
+        :param max_bytes: 缓存音频总大小上限（字节），达到上限后不再合成新的音频
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._clips = {}  # 文字 -> WAV路径
+        self._sizes = {}  # WAV路径 -> 字节数
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._clips)
+
+    def get(self, text):
+        """
+        :return: 文字对应的WAV路径，未合成时返回None
+        """
+        with self._lock:
+            return self._clips.get(text)
+
+    @property
+    def nbytes(self):
+        """已索引音频的总大小（字节）"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    @property
+    def full(self):
+        return self.nbytes >= self.max_bytes
+
+    def add(self, text, path):
+        size = os.path.getsize(path)
+        with self._lock:
+            self._clips[text] = path
+            self._sizes[path] = size
+
+    def clear(self):
+        with self._lock:
+            self._clips.clear()
+            self._sizes.clear()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + ".wav")
+
+    def evict(self, keep):
+        """
+        删除不再需要的音频（名单或语音设置变化后留下的旧文件）
+        :param keep: 需要保留的路径集合
+        :return: 删除的文件数量
+        """
+        keep = {os.path.abspath(path) for path in keep}
+        removed = 0
+        try:
+            entries = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for entry in entries:
+            path = os.path.abspath(os.path.join(self.directory, entry))
+            if entry.endswith(".wav") and path not in keep:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError as e:
+                    print(f"[WARN] 删除过期的朗读音频失败: {e}")
+        with self._lock:
+            self._clips = {text: path for text, path in self._clips.items()
+                           if os.path.abspath(path) in keep}
+            self._sizes = {path: size for path, size in self._sizes.items()
+                           if os.path.abspath(path) in keep}
+        return removed
+
+
+class SpeechWorker:
+    """
+    常驻朗读线程
+    语音引擎只能在创建它的线程中使用，因此引擎的创建、所有朗读以及中止朗读都在同一个线程中完成：
+    cancel()只作废旧请求，正在进行的朗读由引擎在朗读线程中触发的started-word回调发现已作废后自行停止
+    """
+
+    def __init__(self, engine_factory=create_engine, maxsize=SPEECH_QUEUE_SIZE,
+                 on_success=None, on_error=None, timings=NO_TIMINGS):
+        """
+        :param engine_factory: 创建语音引擎的函数（可替换为测试用的假引擎）
+        :param maxsize: 朗读队列容量，队列满时丢弃最早的请求
+        :param on_success: 朗读成功后的回调（在朗读线程中调用）
+        :param on_error: 朗读失败后的回调 on_error(异常)（在朗读线程中调用）
+        :param timings: 各阶段耗时统计（timing.StageTimings）
+        """
+        self.engine_factory = engine_factory
+        self.timings = timings
+        self.on_success = on_success
+        self.on_error = on_error
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._generation = 0      # 每次取消时加1，旧的请求随之作废
+        self._engine = None
+        self._speaking = None     # 正在朗读的请求所属的代数，未在朗读时为None
+        self._thread = None
+        self._renders = deque()   # 等待预合成的文字
+        self._render_cache = None
+        self._render_started = False
+
+    def start(self, preload=True):
+        """
+        启动朗读线程
+        :param preload: 是否在启动时就初始化语音引擎
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(preload,), daemon=True, name="speech")
+        self._thread.start()
+
+    def speak(self, text):
+        """
+        提交朗读请求（不阻塞）
+        :param text: 要朗读的文字
+        """
+        with self._lock:
+            item = (text, self._generation, time.perf_counter())
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                # 队列已满时丢弃最早的请求，保证最新的抽取结果能被读出
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def cancel(self):
+        """
+        取消所有尚未开始的朗读，并让正在进行的朗读在下一个词开始时停止（可在任意线程中调用）
+        """
+        with self._lock:
+            self._generation += 1
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def prerender(self, texts, cache):
+        """
+        在朗读线程空闲时把文字按顺序逐个预合成到缓存中，缓存达到大小上限时停止；
+        开始合成前先删除不在本轮文字中的过期音频。实时朗读请求始终优先于预合成
+        :param texts: 要预合成的文字
+        :param cache: SpeechClipCache
+        """
+        os.makedirs(cache.directory, exist_ok=True)
+        renders = deque(dict.fromkeys(text for text in texts if text))
+        with self._lock:
+            self._renders = renders
+            self._render_cache = cache
+            self._render_started = False
+        if not renders:
+            # 没有需要预合成的文字时，缓存中的音频全部过期
+            cache.evict(())
+            return
+        self._wake()
+
+    def _wake(self):
+        """唤醒可能正在等待队列的朗读线程（放入一个空请求）"""
+        try:
+            self._queue.put_nowait(("", self._generation, time.perf_counter()))
+        except queue.Full:
+            pass
+
+    def shutdown(self):
+        """取消朗读并结束朗读线程"""
+        self.cancel()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def _on_word(self, name, location, length):
+        # 在朗读线程中由引擎调用，朗读的请求已被取消时中止朗读
+        with self._lock:
+            cancelled = self._speaking is not None and self._speaking != self._generation
+            engine = self._engine
+        if cancelled and engine is not None:
+            engine.stop()
+
+    def _init_engine(self):
+        with self.timings.measure("speech.engine_init"):
+            engine = self.engine_factory()
+            engine.connect('started-word', self._on_word)
+        with self._lock:
+            self._engine = engine
+        return engine
+
+    def _run(self, preload):
+        if platform.system() == 'Windows':
+            from comtypes import CoInitialize
+            CoInitialize()
+
+        if preload:
+            try:
+                self._init_engine()
+            except Exception as e:
+                # 预加载失败时不提示，首次朗读时会重新初始化并按朗读失败处理
+                print(f"[WARN] 预加载语音引擎失败: {e}")
+
+        while True:
+            if self._renders:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    self._render_next()
+                    continue
+            else:
+                item = self._queue.get()
+            if item is None:
+                break
+            text, generation, enqueued_at = item
+            with self._lock:
+                if not text or generation != self._generation:
+                    continue
+                engine = self._engine
+            self.timings.record("speech.queue_wait", time.perf_counter() - enqueued_at)
+            try:
+                if engine is None:
+                    engine = self._init_engine()
+                with self._lock:
+                    if generation != self._generation:
+                        continue
+                    self._speaking = generation
+                with self.timings.measure("speech.say"):
+                    engine.say(text)
+                with self.timings.measure("speech.runAndWait"):
+                    engine.runAndWait()
+            except Exception as e:
+                # 引擎出错后丢弃，下次朗读时重新初始化
+                with self._lock:
+                    self._engine = None
+                if self.on_error is not None:
+                    self.on_error(e)
+            else:
+                if self.on_success is not None:
+                    self.on_success()
+            finally:
+                with self._lock:
+                    self._speaking = None
+
+    def _render_next(self):
+        with self._lock:
+            if not self._renders:
+                return
+            text = self._renders.popleft()
+            cache = self._render_cache
+            finished = not self._renders
+            started = self._render_started
+            self._render_started = True
+            pending = [] if started else [text] + list(self._renders)
+        try:
+            engine = self._engine or self._init_engine()
+            settings = (engine.getProperty('voice'), engine.getProperty('rate'), engine.getProperty('volume'))
+            if not started:
+                # 本轮开始时就删除过期音频，不必等整轮合成完成
+                removed = cache.evict({cache.path_for(clip_key(t, *settings)) for t in pending})
+                if removed:
+                    print(f"[INFO] 清理过期朗读音频{removed}条")
+            path = cache.path_for(clip_key(text, *settings))
+            if not os.path.exists(path):
+                if cache.full:
+                    print(f"[INFO] 朗读音频缓存已达上限（{cache.max_bytes // (1024 * 1024)}MB），其余文字抽到时实时朗读")
+                    with self._lock:
+                        self._renders.clear()
+                    return
+                tmp_path = f"{path[:-len('.wav')]}.{os.getpid()}.tmp.wav"
+                with self.timings.measure("speech.prerender"):
+                    engine.save_to_file(text, tmp_path)
+                    engine.runAndWait()
+                os.replace(tmp_path, path)
+            cache.add(text, path)
+        except Exception as e:
+            # 预合成失败不影响实时朗读，放弃本轮预合成
+            print(f"[WARN] 预合成朗读音频失败，抽到时将实时朗读: {e}")
+            with self._lock:
+                self._renders.clear()
+            return
+        if finished:
+            print(f"[INFO] 朗读音频预合成完成: {len(cache)}条")
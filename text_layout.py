@@ -0,0 +1,224 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 名字窗口布局缓存
+按(展示文字, 字体, 屏幕尺寸)缓存名字窗口的尺寸和换行宽度（窗口位置由展示的屏幕区域决定），
+配置加载后分批预先计算整个名单，抽取时不再测量字体；
+自动适配模式下用二分查找得到能放进展示区域的最大字号，结果同样被缓存
+"""
+
+from tkinter import font
+
+FONT_FAMILY = '华文仿宋'
+BASE_FONT_SIZE = 87          # 基准字体大小（1920x1080）
+MIN_FONT_SIZE = 40
+MAX_FONT_SIZE = 150
+PRECOMPUTE_CHUNK = 50        # 预计算时每批处理的文字数量
+
+TEXT_FIT_MODES = ["screen", "auto"]  # screen: 按屏幕宽度确定字号；auto: 自动适配展示区域
+DEFAULT_TEXT_FIT = {"mode": "screen", "box_width": 0.8, "box_height": 0.4}
+AUTO_FIT_MIN_SIZE = 12
+AUTO_FIT_MAX_SIZE = 300
+
+
+def screen_font_size(screen_width):
+    """
+    根据屏幕宽度计算字体大小
+    :param screen_width: 屏幕宽度（像素）
+    """
+    font_size = int(BASE_FONT_SIZE * (screen_width / 1920))
+    return max(MIN_FONT_SIZE, min(font_size, MAX_FONT_SIZE))  # 设置合理范围
+
+
+def validate_text_fit(value):
+    """
+    检查文字适配设置
+    :param value: 配置中的text_fit字段
+    :return: 错误信息列表
+    """
+    if not isinstance(value, dict):
+        return ["text_fit必须为对象格式"]
+    errors = []
+    if value.get('mode', 'screen') not in TEXT_FIT_MODES:
+        errors.append(f"text_fit的mode必须为{'、'.join(TEXT_FIT_MODES)}之一: {value.get('mode')}")
+    for field in ('box_width', 'box_height'):
+        ratio = value.get(field, DEFAULT_TEXT_FIT[field])
+        if isinstance(ratio, bool) or not isinstance(ratio, (int, float)) or not 0 < ratio <= 1:
+            errors.append(f"text_fit的{field}必须为0到1之间的数（占屏幕的比例）: {ratio}")
+    return errors
+
+
+def window_size(text_width, text_height, font_size):
+    """
+    根据文字尺寸计算名字窗口尺寸
+    :return: (窗口宽, 窗口高)
+    """
+    # 优化窗口尺寸计算（减少边距）
+    window_width = int(text_width * 1.1 + 20)  # 10%边距 + 固定20px
+    window_height = int(text_height * 1.2 + 20)  # 20%边距 + 固定20px
+
+    # 确保窗口最小尺寸（根据字体大小动态调整）
+    min_width = max(150, font_size * 2)  # 至少2个字的宽度
+    min_height = max(80, font_size + 20)  # 字体高度+20px
+    return max(window_width, min_width), max(window_height, min_height)
+
+
+class Layout:
+    """
+    一段文字对应的名字窗口布局
+    """
+
+    __slots__ = ('font_size', 'width', 'height', 'wraplength')
+
+    def __init__(self, font_size, width, height, wraplength):
+        self.font_size = font_size
+        self.width = width
+        self.height = height
+        self.wraplength = wraplength
+
+    @property
+    def font(self):
+        return (FONT_FAMILY, self.font_size)
+
+
+class LayoutCache:
+    """
+    名字窗口布局缓存，只能在Tk主线程中使用
+    """
+
+    def __init__(self, root, family=FONT_FAMILY):
+        """
+        :param root: Tk根窗口
+        :param family: 字体名称
+        """
+        self.root = root
+        self.family = family
+        self.text_fit = dict(DEFAULT_TEXT_FIT)
+        self._fonts = {}      # 字号 -> font.Font
+        self._layouts = {}    # (文字, 字体, 字号, 屏幕宽, 屏幕高) -> Layout
+        self._fit_sizes = {}  # (文字, 字体, 区域宽, 区域高) -> 字号
+        self._screen = None
+        self._precompute_job = None
+
+    @property
+    def screen(self):
+        """缓存的屏幕尺寸(宽, 高)"""
+        if self._screen is None:
+            self._screen = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        return self._screen
+
+    def refresh_screen(self):
+        """重新读取屏幕尺寸（分辨率变化后调用），旧布局因键不同自然失效"""
+        self._screen = None
+        return self.screen
+
+    def configure_fit(self, text_fit):
+        """
+        设置文字适配方式
+        :param text_fit: 配置中的text_fit字段，None表示使用默认值
+        """
+        self.text_fit = dict(DEFAULT_TEXT_FIT, **(text_fit or {}))
+
+    @property
+    def box(self):
+        """自动适配模式下的展示区域(宽, 高)（像素）"""
+        screen_width, screen_height = self.screen
+        return (int(screen_width * self.text_fit['box_width']),
+                int(screen_height * self.text_fit['box_height']))
+
+    def _text_size(self, lines, font_size):
+        custom_font = self.get_font(font_size)
+        text_width = max(custom_font.measure(line) for line in lines)
+        text_height = custom_font.metrics("linespace") * len(lines)
+        return text_width, text_height
+
+    def fit_font_size(self, text, box_width, box_height):
+        """
+        二分查找能让名字窗口放进展示区域的最大字号，结果按(文字, 字体, 区域)缓存
+        :param text: 展示文字
+        :param box_width: 区域宽度（像素）
+        :param box_height: 区域高度（像素）
+        :return: 字号，最小字号也放不下时返回最小字号
+        """
+        key = (text, self.family, box_width, box_height)
+        size = self._fit_sizes.get(key)
+        if size is not None:
+            return size
+
+        lines = text.split("\n")
+        low, high = AUTO_FIT_MIN_SIZE, AUTO_FIT_MAX_SIZE
+        size = low
+        while low <= high:
+            mid = (low + high) // 2
+            width, height = window_size(*self._text_size(lines, mid), mid)
+            if width <= box_width and height <= box_height:
+                size = mid
+                low = mid + 1
+            else:
+                high = mid - 1
+        self._fit_sizes[key] = size
+        return size
+
+    def get_font(self, size):
+        """获取缓存的字体对象"""
+        f = self._fonts.get(size)
+        if f is None:
+            f = font.Font(family=self.family, size=size)
+            self._fonts[size] = f
+        return f
+
+    def get(self, text):
+        """
+        获取文字对应的窗口布局，未缓存时计算并缓存
+        :param text: 展示文字（批量抽取时为多行文本）
+        :return: Layout
+        """
+        screen_width, screen_height = self.screen
+        if self.text_fit['mode'] == 'auto':
+            font_size = self.fit_font_size(text, *self.box)
+        else:
+            font_size = screen_font_size(screen_width)
+        key = (text, self.family, font_size, screen_width, screen_height)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._compute(text, font_size)
+            self._layouts[key] = layout
+        return layout
+
+    def _compute(self, text, font_size):
+        # 计算文本尺寸（批量抽取时为多行文本）
+        text_width, text_height = self._text_size(text.split("\n"), font_size)
+        window_width, window_height = window_size(text_width, text_height, font_size)
+        return Layout(font_size, window_width, window_height,
+                      int(text_width * 1.05))  # 仅比实际宽度多5%
+
+    def precompute(self, texts, chunk=PRECOMPUTE_CHUNK):
+        """
+        在Tk事件循环空闲时分批计算布局，不阻塞界面
+        :param texts: 要预先计算的文字
+        :param chunk: 每批处理的数量
+        """
+        if self._precompute_job is not None:
+            self.root.after_cancel(self._precompute_job)
+            self._precompute_job = None
+        pending = list(dict.fromkeys(texts))
+
+        def step(start=0):
+            for text in pending[start:start + chunk]:
+                self.get(text)
+            if start + chunk < len(pending):
+                self._precompute_job = self.root.after(1, step, start + chunk)
+            else:
+                self._precompute_job = None
+
+        if pending:
+            self._precompute_job = self.root.after_idle(step)
+
+    def clear(self):
+        self._layouts.clear()
+        self._fit_sizes.clear()
+
+    def __len__(self):
+        return len(self._layouts)
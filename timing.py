@@ -0,0 +1,78 @@
+"""
+coding: utf-8
+©2025 GZYzhy Publish under Apache License 2.0
+GitHub: https://github.com/gzyzhy/Name-Random-Picker
+
+随机抽签器 - 耗时统计
+记录朗读、彩蛋音频和结果窗口等各阶段的耗时，用于定位抽取后的延迟来源
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StageTimings:
+    """
+    各阶段耗时统计（线程安全）
+    """
+
+    def __init__(self, enabled=True, on_record=None):
+        """
+        :param enabled: 是否记录
+        :param on_record: 每次记录后的回调 on_record(阶段, 秒数)（在记录所在的线程中调用）
+        """
+        self.enabled = enabled
+        self.on_record = on_record
+        self._stats = {}  # 阶段 -> [次数, 总耗时, 最大耗时]
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        """
+        记录一次耗时
+        :param stage: 阶段名称
+        :param seconds: 耗时（秒）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(stage, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+        if self.on_record is not None:
+            self.on_record(stage, seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        """统计with语句块的耗时"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self):
+        """
+        :return: {阶段: (次数, 平均耗时毫秒, 最大耗时毫秒)}
+        """
+        with self._lock:
+            return {stage: (count, total / count * 1e3, peak * 1e3)
+                    for stage, (count, total, peak) in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def format_summary(self):
+        """生成便于打印的统计表"""
+        lines = [f"{'阶段':<24}{'次数':>6}{'平均(ms)':>12}{'最大(ms)':>12}"]
+        for stage, (count, mean_ms, peak_ms) in sorted(self.summary().items()):
+            lines.append(f"{stage:<24}{count:>6}{mean_ms:>12.2f}{peak_ms:>12.2f}")
+        return "\n".join(lines)
+
+
+NO_TIMINGS = StageTimings(enabled=False)  # 未指定统计对象时使用，不做任何记录